@@ -1,7 +1,12 @@
+from budget import Budget
+from graph import DEFAULT_SNAPSHOT
 from service import Controller
 
 
 class UI:
+    # Number of seconds after which the searches started from the menu give up and show their partial result
+    TIME_LIMIT = 60
+
     def __init__(self):
         self.__controller = Controller()
 
@@ -156,7 +161,11 @@ class UI:
             print("Invalid input! Please enter an integer.")
             return
 
-        self.__controller.graph.setter_the_cost_of_edge(edge_id, new_cost)
+        try:
+            self.__controller.set_cost_of_edge(edge_id, new_cost)
+        except ValueError as e:
+            print(e)
+            return
         print(f"The cost of edge {edge_id} has been modified to {new_cost}.")
 
     def add_edge(self):
@@ -185,7 +194,11 @@ class UI:
         elif self.__controller.graph.checker_of_edge_existence(x, y):
             print(f"There is already an edge from {x} to {y}.")
         else:
-            self.__controller.graph.adder_of_edge_to_graph(x, y, cost)
+            try:
+                self.__controller.add_edge(x, y, cost)
+            except ValueError as e:
+                print(e)
+                return
             print(f"The edge from {x} to {y} with cost {cost} has been added.")
 
     def remove_edge(self):
@@ -207,7 +220,11 @@ class UI:
             return
 
         if self.__controller.graph.checker_of_edge_existence(x, y):
-            self.__controller.graph.remover_of_edge_from_graph(x, y)
+            try:
+                self.__controller.remove_edge(x, y)
+            except ValueError as e:
+                print(e)
+                return
             print(f"The edge from {x} to {y} has been removed!")
         else:
             print(f"There is no edge from {x} to {y}.")
@@ -226,7 +243,11 @@ class UI:
             except ValueError:
                 print("Invalid input! Please enter an integer for the number of vertices.")
                 return
-            self.__controller.graph.setter_for_vertices_counter(vertices_count)
+            try:
+                self.__controller.set_vertices_counter(vertices_count)
+            except ValueError as e:
+                print(e)
+                return
 
         try:
             vertex = int(input("Please enter the vertex: "))
@@ -234,7 +255,11 @@ class UI:
             print("Invalid input! Please enter an integer for the vertex.")
             return
 
-        self.__controller.graph.adder_of_vertex_into_graph(vertex)
+        try:
+            self.__controller.add_vertex(vertex)
+        except ValueError as e:
+            print(e)
+            return
         print("Vertex added successfully!")
 
     def remove_vertex(self):
@@ -249,26 +274,44 @@ class UI:
             print("Invalid input! Please enter an integer for the vertex.")
             return
 
-        self.__controller.graph.remover_of_vertex_from_graph(vertex)
+        try:
+            self.__controller.remove_vertex(vertex)
+        except ValueError as e:
+            print(e)
+            return
         print("Vertex removed successfully!")
 
     def copy_graph(self):
         """
         Copy the graph.
 
-        This function creates a copy of the graph.
+        This function saves a named snapshot of the graph, or restores the graph to one. Snapshots are copy-on-write:
+        taking one is instant and restoring one only undoes the changes made since.
         """
         option = int(
             input("Insert:\n\t1-if you want to restore an already copied Graph\n\t2-if you want to copy this graph:\n"))
+        graph = self.__controller.graph
         if option == 2:
-            self.__controller.graph.getter_of_copy_of_graph()
+            name = input("Name of the copy (empty for the default one): ") or DEFAULT_SNAPSHOT
+            graph.take_snapshot(name)
             print("Graph copied successfully!")
         elif option == 1:
-            ok = self.__controller.graph.set_copy_of_graph()
-            if ok == 1:
+            names = graph.getter_snapshot_names()
+            if not names:
                 print("You have not made any copies.")
-            else:
-                print("Graph copied successfully!")
+                return
+            name = input(f"Name of the copy to restore ({', '.join(names)}): ") or DEFAULT_SNAPSHOT
+            try:
+                graph.restore_snapshot(name)
+            except ValueError as e:
+                print(e)
+                return
+            print("Graph restored successfully!")
+            journal = self.__controller.journal
+            if journal is not None:
+                # The journal only records single changes, so the restored graph is saved as a whole
+                self.__controller.compact_journal()
+                print(f"The journal was compacted into {journal.base_filename()}.")
 
     def print_the_cost(self):
         """
@@ -292,8 +335,51 @@ class UI:
         This function prompts the user to enter the filename and reads the graph from that file.
         """
         filename = input("Please enter the filename: ")
-        self.__controller.read_graph_from_file(filename)
+        self.__controller.bulk_read_graph_from_file(filename, self.print_progress)
+        print()
+        print("Graph read from file successfully!")
+
+    def read_journaled_graph_from_file(self):
+        """
+        Read a graph from a file and record its changes in a journal.
+
+        This function prompts the user to enter the filename, reads the graph from that file and replays the changes
+        recorded in <filename>.journal; the next changes are appended to it. The journal is compacted into a new base
+        file, v<generation>-<filename>, when it grows larger than the graph or when a copy of the graph is restored.
+        The file itself is never modified.
+        """
+        filename = input("Please enter the filename: ")
+        replayed = self.__controller.open_journal(filename, self.print_progress)
+        print()
         print("Graph read from file successfully!")
+        journal = self.__controller.journal
+        if replayed:
+            print(f"{replayed} changes replayed from {journal.filename} on top of {journal.base_filename()}.")
+        print(f"The changes are recorded in {journal.filename}.")
+
+    @staticmethod
+    def print_progress(done, total):
+        """
+        Print, on a single console line, how many of the total items have been processed.
+        """
+        print(f"\r{done}/{total}", end="")
+
+    @staticmethod
+    def print_throughput(written, seconds):
+        """
+        Print how many megabytes were written and at which rate.
+        """
+        megabytes = written / (1 << 20)
+        print(f"Wrote {megabytes:.2f} MB in {seconds:.2f}s ({megabytes / max(seconds, 1e-9):.1f} MB/s).")
+
+    @staticmethod
+    def print_budget_status(budget):
+        """
+        Tell the user when a search was stopped by its budget, so its result is only partial.
+        """
+        if budget.exhausted():
+            print(f"The search was stopped after {budget.expansions} steps ({budget.status}), "
+                  f"the result is partial.")
 
     def write_graph_to_file(self):
         """
@@ -301,25 +387,56 @@ class UI:
 
         This function prompts the user to enter the filename to which the graph will be written.
         """
-        filename = input("Please enter the filename: ")
-        self.__controller.write_graph_to_file(filename)
+        filename = input("Please enter the filename (.gz, .bz2 or .xz to compress it): ")
+        written, seconds = self.__controller.write_graph_to_file(filename)
         print("Graph written to file successfully!")
+        self.print_throughput(written, seconds)
 
     def generate_random_graph(self):
         """
         Generate a random graph.
 
-        This function prompts the user to enter the number of vertices and edges for the random graph.
+        This function prompts the user to enter the number of vertices and edges for the random graph, and
+        optionally a seed to generate the same graph again.
         """
         try:
-            n, m = map(int, input("Please enter the number of vertices and edges: ").split())
+            n, m, *seed = map(int, input("Please enter the number of vertices and edges (and optionally a seed): ")
+                              .split())
         except ValueError:
             print("Invalid input! Please enter integers for the number of vertices and edges.")
             return
 
-        self.__controller.generate_random_graph(n, m)
+        try:
+            self.__controller.generate_random_graph(n, m, seed[0] if seed else None)
+        except ValueError as e:
+            print(e)
+            return
         print("Random graph generated successfully!")
 
+    def write_random_graph_to_file(self):
+        """
+        Write a random graph straight to a file, without replacing the current graph.
+
+        This function prompts the user to enter the number of vertices and edges, optionally a seed, and the
+        filename (.bin for the binary format).
+        """
+        try:
+            n, m, *seed = map(int, input("Please enter the number of vertices and edges (and optionally a seed): ")
+                              .split())
+        except ValueError:
+            print("Invalid input! Please enter integers for the number of vertices and edges.")
+            return
+        filename = input("Please enter the filename (.bin for the binary format, .gz, .bz2 or .xz to compress it): ")
+
+        try:
+            written, seconds = self.__controller.write_random_graph_to_file(filename, n, m, seed[0] if seed else None,
+                                                                            filename.endswith(".bin"))
+        except ValueError as e:
+            print(e)
+            return
+        print("Random graph written to file successfully!")
+        self.print_throughput(written, seconds)
+
     def bfs(self):
         try:
             x, y = input("Please enter the 2 vertices: ").split()
@@ -330,8 +447,12 @@ class UI:
         if x >= self.__controller.graph.getter_for_vertices_counter() or y >= self.__controller.graph.getter_for_vertices_counter():
             print("The provided vertices MUST BE between 0 and n - 1. Try again!")
             return
-        path = self.__controller.forward_bfs(x, y)
-        if len(path) == 0:
+        budget = Budget(self.TIME_LIMIT)
+        path = self.__controller.forward_bfs(x, y, budget)
+        self.print_budget_status(budget)
+        if path is None:
+            print("No path from " + str(x) + " to " + str(y) + " was found before the search was stopped.")
+        elif len(path) == 0:
             print("There is no path from " + str(x) + " to " + str(y))
         else:
             print("The length of the shortest path is " + str(len(path) - 1))
@@ -340,7 +461,9 @@ class UI:
             print(path)
 
     def ui_hamiltonian_cycle(self):
-        self.__controller.approximateTSPNearestNeighbour()
+        budget = Budget(self.TIME_LIMIT)
+        self.__controller.approximateTSPNearestNeighbour(budget)
+        self.print_budget_status(budget)
         hamPathVertices = self.__controller.graph.hamPathVertices
         if len(hamPathVertices) == 0:
             print("No cycle was found!")
@@ -351,6 +474,30 @@ class UI:
                 print(hamPathVertices[i], "->", hamPathVertices[i - 1], "")
             print(hamPathVertices[0], "->", hamPathVertices[-1], "\n")
 
+    def ui_tsp_local_search(self):
+        try:
+            start_vertex = int(input("Please enter the start vertex: "))
+            time_budget = float(input("Please enter the time budget in seconds: "))
+        except ValueError:
+            print("Invalid input! Please enter an integer vertex and a number of seconds.")
+            return
+
+        try:
+            tour, cost, missing_edges, history = self.__controller.approximate_tsp_local_search(start_vertex,
+                                                                                                time_budget)
+        except ValueError as e:
+            print(e)
+            return
+        print("Tour cost over time:")
+        step = max(1, len(history) // 10)
+        for seconds, tour_cost, missing in history[::step] + ([history[-1]] if (len(history) - 1) % step else []):
+            print(f"\t{seconds:.3f}s: {tour_cost}" + (f" (missing edges: {missing})" if missing else ""))
+        if missing_edges:
+            print(f"No Hamiltonian cycle was found: edges of the best tour that do not exist: {missing_edges}.")
+            return
+        print("Hamiltonian cycle cost:", cost)
+        print(" -> ".join(map(str, tour + tour[:1])))
+
     def ui_lowest_cost_walk(self):
         try:
             start_vertex, end_vertex = input("Please enter the start and end vertices: ").split()
@@ -364,7 +511,9 @@ class UI:
             return
 
         try:
-            cost, path = self.__controller.lowest_cost_walk(start_vertex, end_vertex)
+            budget = Budget(self.TIME_LIMIT)
+            cost, path = self.__controller.lowest_cost_walk(start_vertex, end_vertex, budget)
+            self.print_budget_status(budget)
             if len(path) == 0:
                 print("There is no path from {} to {}".format(start_vertex, end_vertex))
             else:
@@ -374,9 +523,43 @@ class UI:
         except Exception as e:
             print("An error occurred:", e)
 
+    def ui_dijkstra(self):
+        try:
+            start_vertex, end_vertex = input("Please enter the start and end vertices: ").split()
+            start_vertex, end_vertex = int(start_vertex), int(end_vertex)
+        except ValueError:
+            print("Invalid input! Please enter two integers separated by a space.")
+            return
+
+        try:
+            budget = Budget(self.TIME_LIMIT)
+            cost, path = self.__controller.lowest_cost_walk_dijkstra(start_vertex, end_vertex, budget)
+            self.print_budget_status(budget)
+            if len(path) == 0:
+                print("There is no path from {} to {}".format(start_vertex, end_vertex))
+                return
+            print("The cost of the lowest cost walk is:", cost)
+            print("The lowest cost walk from {} to {} is:".format(start_vertex, end_vertex))
+            print(path)
+        except Exception as e:
+            print("An error occurred:", e)
+
     def ui_prim_algorithm(self):
+        algorithm = input("Choose the algorithm:\n\t1-Prim's Algorithm\n\t2-Prim's Algorithm (heap, spanning forest)"
+                          "\n\t3-Kruskal's Algorithm (union-find, spanning forest)\n")
+        if algorithm == "3":
+            budget = Budget(self.TIME_LIMIT)
+            self.print_spanning_forest(self.__controller.kruskal_forest(budget))
+            self.print_budget_status(budget)
+            return
         start_vertex = int(input("Give the starting vertex: "))
-        mst_edges = self.__controller.prim_algorithm(start_vertex)
+        budget = Budget(self.TIME_LIMIT)
+        if algorithm == "2":
+            self.print_spanning_forest(self.__controller.prim_forest(start_vertex, budget))
+            self.print_budget_status(budget)
+            return
+        mst_edges = self.__controller.prim_algorithm(start_vertex, budget)
+        self.print_budget_status(budget)
         total_cost = 0
         print("The minimum spanning tree will have the edges: ")
         for start, end in mst_edges:
@@ -384,6 +567,35 @@ class UI:
             total_cost += self.__controller.graph.getter_the_cost_of_edge_with_edges(start, end)
         print(f"The total cost of this MST is {total_cost}.")
 
+    @staticmethod
+    def print_spanning_forest(forest_edges):
+        """
+        Print the edges of a minimum spanning forest, given as (start, end, cost) triples, and its total cost.
+        """
+        print("The minimum spanning forest will have the edges: ")
+        for start, end, cost in forest_edges:
+            print(f"{start} <-> {end}")
+        print(f"The total cost of this minimum spanning forest is {sum(cost for _, _, cost in forest_edges)}.")
+
+    def print_summary(self):
+        """
+        Print a summary of the graph: its counts, the out-degree and in-degree histograms and the vertices of
+        highest degree, all computed in one vectorized pass (see Graph.getter_statistics).
+        """
+        statistics = self.__controller.graph.getter_statistics()
+        summary = statistics.summary()
+        print(f"Vertices: {summary['vertices']}, edges: {summary['edges']}, total cost: {summary['total_cost']}")
+        print(f"Isolated vertices: {summary['isolated']}, sources: {summary['sources']}, sinks: {summary['sinks']}")
+        print(f"Largest in-degree: {summary['max_in_degree']}, largest out-degree: {summary['max_out_degree']}, "
+              f"average out-degree: {summary['average_out_degree']:.2f}")
+        for direction in ("out", "in"):
+            histogram = statistics.degree_histogram(direction)
+            print(f"{direction.capitalize()}-degree histogram (degree: number of vertices):")
+            print(", ".join(f"{degree}: {count}" for degree, count in enumerate(histogram) if count))
+        print("Vertices of highest degree (vertex: in-degree + out-degree):")
+        for vertex, degree in statistics.top_hubs(10):
+            print(f"{vertex}: {degree}")
+
     def print_menu(self):
         """
         Print the menu of the application.
@@ -409,11 +621,16 @@ class UI:
             "Generate a random graph",
             "Iterate through the set of inbound edges of a vertex",
             "Iterate through the set of outbound edges of a vertex",
-            "Find the shortest path between 2 vertices, using a forward breadth-first search",
-            "Find the lowest cost walk between the given vertices, using Bellman Ford's algorithm",
-            "Get a minimum spanning tree (using Prim's Algorithm)",
+            "Find the shortest path between 2 vertices, using a bidirectional breadth-first search",
+            "Find the lowest cost walk between the given vertices (Dijkstra, or Bellman-Ford when there are negative costs)",
+            "Get a minimum spanning tree (using Prim's or Kruskal's Algorithm)",
             "Find a Hamilton cycle of low cost(approximate TSP)",
-            "Exit"
+            "Exit",
+            "Find the lowest cost walk between the given vertices, using Dijkstra's algorithm (non-negative costs)",
+            "Find a Hamilton cycle of low cost, using nearest neighbour and 2-opt / Or-opt local search",
+            "Print a summary of the graph (degree histograms, vertices of highest degree)",
+            "Write a random graph straight to a file, without loading it",
+            "Read graph from file, recording its changes in a journal (<file>.journal)"
         ]
 
         print("\nMenu:")
@@ -474,9 +691,25 @@ class UI:
             elif command == "22":
                 self.ui_hamiltonian_cycle()
             elif command == "23":
+                journal = self.__controller.journal
+                if journal is not None:
+                    # Only the last batch of changes is missing from the journal
+                    self.__controller.close_journal()
+                    print(f"Changes saved to {journal.filename} (on top of {journal.base_filename()}).")
                 filename = "graph" + str(self.__controller.graph.getter_for_vertices_counter()) + "_modif.txt"
-                self.__controller.write_graph_to_file(filename)
+                written, seconds = self.__controller.write_graph_to_file(filename)
+                self.print_throughput(written, seconds)
                 print("Goodbye!")
                 return
+            elif command == "24":
+                self.ui_dijkstra()
+            elif command == "25":
+                self.ui_tsp_local_search()
+            elif command == "26":
+                self.print_summary()
+            elif command == "27":
+                self.write_random_graph_to_file()
+            elif command == "28":
+                self.read_journaled_graph_from_file()
             else:
                 print("Invalid command!. Please try again!")
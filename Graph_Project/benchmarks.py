@@ -0,0 +1,196 @@
+import random
+import sys
+import time
+
+from graph import Graph
+from graph_io import COMPRESSIONS
+from service import Controller
+
+
+def timed(function, *args):
+    """
+    Call function(*args) and measure how long it takes.
+
+    :return: A tuple (seconds, result).
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def benchmark_loader(filename):
+    """
+    Compare the line by line loader (Controller.read_graph_from_file) with the chunked bulk loader
+    (Controller.bulk_read_graph_from_file) on the same file.
+
+    :param filename: The name of the graph file to load.
+    :type filename: str
+    """
+    controller = Controller()
+    line_time, _ = timed(controller.read_graph_from_file, filename)
+    edges = controller.graph.getter_number_of_edges()
+    bulk_time, _ = timed(controller.bulk_read_graph_from_file, filename)
+    print(f"Loading {edges} edges from {filename}:")
+    print(f"\tline by line: {line_time:.3f}s")
+    print(f"\tbulk:         {bulk_time:.3f}s ({line_time / bulk_time:.1f}x)")
+
+
+def benchmark_writer(filename, output_filename):
+    """
+    Compare the former one write per edge text writer with the batched writer of Controller.write_graph_to_file,
+    uncompressed and with every available codec.
+
+    :param filename: The name of the graph file to load.
+    :type filename: str
+    :param output_filename: The name of the file to write (the codec extensions are appended to it).
+    :type output_filename: str
+    """
+    controller = Controller()
+    controller.bulk_read_graph_from_file(filename)
+    graph = controller.graph
+
+    def write_per_edge():
+        with open(output_filename, "w") as file:
+            file.write(f"{graph.getter_for_vertices_counter()} {graph.getter_number_of_edges()}\n")
+            out_edges = graph.get_child_edges()
+            for x in out_edges:
+                for y in out_edges[x]:
+                    file.write(f"{x} {y} {graph.getter_the_cost_of_edge(out_edges[x][y])}\n")
+
+    per_edge_time, _ = timed(write_per_edge)
+    print(f"Writing {graph.getter_number_of_edges()} edges:")
+    print(f"\tper edge:     {per_edge_time:.3f}s")
+    written, seconds = controller.write_graph_to_file(output_filename)
+    print(f"\tbatched:      {seconds:.3f}s ({written / (1 << 20) / seconds:.1f} MB/s)")
+    for compression, (_, extension) in COMPRESSIONS.items():
+        written, seconds = controller.write_graph_to_file(output_filename + extension, compression)
+        print(f"\t{compression + ':':<13} {seconds:.3f}s ({written / (1 << 20) / seconds:.1f} MB/s)")
+
+
+def benchmark_mst(filename, start="0"):
+    """
+    Compare the minimum spanning tree implementations of the Controller on the same graph.
+
+    :param filename: The name of the graph file to load.
+    :type filename: str
+    :param start: The vertex from which Prim's Algorithm starts.
+    :type start: str
+    """
+    controller = Controller()
+    controller.bulk_read_graph_from_file(filename)
+    start = int(start)
+    print(f"Minimum spanning tree of {controller.graph.getter_number_of_edges()} edges:")
+    seconds, tree = timed(controller.prim_algorithm, start)
+    print(f"\tprim (PriorityQueue): {seconds:.3f}s, {len(tree)} edges")
+    seconds, forest = timed(controller.prim_forest, start)
+    print(f"\tprim (heapq forest):  {seconds:.3f}s, {len(forest)} edges, cost {sum(cost for _, _, cost in forest)}")
+    seconds, forest = timed(controller.kruskal_forest)
+    print(f"\tkruskal (union-find): {seconds:.3f}s, {len(forest)} edges, cost {sum(cost for _, _, cost in forest)}")
+
+
+def benchmark_all_pairs(filename):
+    """
+    Compare the all-pairs shortest path engines of the Controller (Floyd-Warshall and Johnson's algorithm) with
+    one bellman_ford call per source vertex.
+
+    :param filename: The name of the graph file to load.
+    :type filename: str
+    """
+    controller = Controller()
+    controller.bulk_read_graph_from_file(filename)
+    vertices = sorted(controller.graph.getter_for_all_vertices())
+    print(f"All-pairs lowest costs of {len(vertices)} vertices and {controller.graph.getter_number_of_edges()} edges:")
+    seconds, _ = timed(lambda: [controller.bellman_ford(vertex) for vertex in vertices])
+    print(f"\tbellman_ford per source: {seconds:.3f}s")
+    seconds, _ = timed(controller.floyd_warshall)
+    print(f"\tfloyd_warshall:          {seconds:.3f}s")
+    seconds, _ = timed(controller.johnson)
+    print(f"\tjohnson:                 {seconds:.3f}s")
+
+
+def benchmark_batch(filename, queries="1000", sources="100"):
+    """
+    Compare answering random lowest cost walk queries one at a time with Controller.lowest_cost_walk and with
+    Controller.batch_lowest_cost_walks.
+
+    :param filename: The name of the graph file to load.
+    :type filename: str
+    :param queries: The number of random queries.
+    :type queries: str
+    :param sources: The number of distinct start vertices among the queries.
+    :type sources: str
+    """
+    controller = Controller()
+    controller.bulk_read_graph_from_file(filename)
+    vertices = sorted(controller.graph.getter_for_all_vertices())
+    starts = random.sample(vertices, min(int(sources), len(vertices)))
+    pairs = [(random.choice(starts), random.choice(vertices)) for _ in range(int(queries))]
+
+    def one_at_a_time():
+        for start_vertex, end_vertex in pairs:
+            try:
+                controller.lowest_cost_walk(start_vertex, end_vertex)
+            except Exception:
+                pass
+
+    print(f"{len(pairs)} queries from {len(starts)} start vertices:")
+    seconds, _ = timed(one_at_a_time)
+    print(f"\tone at a time: {seconds:.3f}s")
+    seconds, _ = timed(lambda: list(controller.batch_lowest_cost_walks(pairs)))
+    print(f"\tbatch:         {seconds:.3f}s")
+
+
+def benchmark_random(vertices, edges, output_filename, seed="0"):
+    """
+    Compare the former random graph generator, which draws random endpoints and retries while the edge already
+    exists, with Controller.generate_random_graph, and time writing the same graph straight to a text and a binary
+    file with Controller.write_random_graph_to_file.
+
+    :param vertices: The number of vertices.
+    :type vertices: str
+    :param edges: The number of edges (the former generator is skipped above 90% of the possible edges).
+    :type edges: str
+    :param output_filename: The name of the text file to write (.bin is appended for the binary file).
+    :type output_filename: str
+    :param seed: The seed of the generators.
+    :type seed: str
+    """
+    vertices, edges, seed = int(vertices), int(edges), int(seed)
+    controller = Controller()
+
+    def rejection_sampling():
+        rng = random.Random(seed)
+        graph = Graph(vertices)
+        for _ in range(edges):
+            start_node, end_node = rng.randint(0, vertices - 1), rng.randint(0, vertices - 1)
+            while graph.checker_of_edge_existence(start_node, end_node):
+                start_node, end_node = rng.randint(0, vertices - 1), rng.randint(0, vertices - 1)
+            graph.adder_of_edge_to_graph(start_node, end_node, rng.randint(1, 100))
+
+    print(f"Random graph of {vertices} vertices and {edges} edges:")
+    if edges <= 0.9 * vertices * vertices:
+        seconds, _ = timed(rejection_sampling)
+        print(f"	rejection sampling: {seconds:.3f}s")
+    seconds, _ = timed(controller.generate_random_graph, vertices, edges, seed)
+    print(f"	sampled:            {seconds:.3f}s")
+    written, seconds = controller.write_random_graph_to_file(output_filename, vertices, edges, seed)
+    print(f"	text file:          {seconds:.3f}s ({written / (1 << 20) / seconds:.1f} MB/s)")
+    written, seconds = controller.write_random_graph_to_file(output_filename + ".bin", vertices, edges, seed, True)
+    print(f"	binary file:        {seconds:.3f}s ({written / (1 << 20) / seconds:.1f} MB/s)")
+
+
+BENCHMARKS = {
+    "loader": benchmark_loader,
+    "writer": benchmark_writer,
+    "mst": benchmark_mst,
+    "all_pairs": benchmark_all_pairs,
+    "batch": benchmark_batch,
+    "random": benchmark_random,
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(f"Usage: python benchmarks.py <{'|'.join(BENCHMARKS)}> [arguments]")
+        sys.exit(1)
+    BENCHMARKS[sys.argv[1]](*sys.argv[2:])
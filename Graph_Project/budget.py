@@ -0,0 +1,85 @@
+import threading
+import time
+
+COMPLETED = "completed"
+BUDGET_EXHAUSTED = "budget exhausted"
+CANCELLED = "cancelled"
+
+
+class CancellationToken:
+    def __init__(self):
+        """
+        complexity: θ(1)
+        Initialize a token that lets another thread ask a running algorithm to stop.
+        The algorithm notices the request at its next expansion and returns its partial result.
+        """
+        self.__event = threading.Event()
+
+    def cancel(self):
+        """
+        complexity: θ(1)
+        Ask the algorithms watching this token to stop.
+        """
+        self.__event.set()
+
+    def is_cancelled(self):
+        """
+        complexity: θ(1)
+        :return: True if cancel was called, False otherwise.
+        :rtype: bool
+        """
+        return self.__event.is_set()
+
+
+class Budget:
+    def __init__(self, seconds=None, max_expansions=None, cancellation_token=None):
+        """
+        complexity: θ(1)
+        Initialize the budget of a long-running algorithm.
+
+        The algorithms of the Controller call spend once per expansion (a vertex popped from a queue, a node of a
+        search, an improving move, ...) and stop as soon as it returns False, returning the partial result they
+        have so far; status then tells why they stopped.
+
+        :param seconds: The number of seconds, counted from now, after which the algorithm has to stop,
+                        or None for no time limit. Default value is None.
+        :type seconds: float
+        :param max_expansions: The maximum number of expansions, or None for no limit. Default value is None.
+        :type max_expansions: int
+        :param cancellation_token: A token whose cancellation stops the algorithm. Default value is None.
+        :type cancellation_token: CancellationToken
+        """
+        self.__deadline = None if seconds is None else time.perf_counter() + seconds
+        self.__max_expansions = max_expansions
+        self.__cancellation_token = cancellation_token
+        self.expansions = 0
+        self.status = COMPLETED
+
+    def spend(self, expansions=1):
+        """
+        complexity: θ(1)
+        Record expansions and check whether the algorithm may go on.
+
+        :param expansions: The number of expansions to record. Default value is 1.
+        :type expansions: int
+        :return: True if the algorithm may continue, False if it has to stop.
+        :rtype: bool
+        """
+        if self.status != COMPLETED:
+            return False
+        self.expansions += expansions
+        if self.__cancellation_token is not None and self.__cancellation_token.is_cancelled():
+            self.status = CANCELLED
+        elif self.__max_expansions is not None and self.expansions > self.__max_expansions:
+            self.status = BUDGET_EXHAUSTED
+        elif self.__deadline is not None and time.perf_counter() > self.__deadline:
+            self.status = BUDGET_EXHAUSTED
+        return self.status == COMPLETED
+
+    def exhausted(self):
+        """
+        complexity: θ(1)
+        :return: True if the algorithm was stopped before it finished, so its result is partial.
+        :rtype: bool
+        """
+        return self.status != COMPLETED
@@ -0,0 +1,754 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+from graph import next_version
+from graph_statistics import GraphStatistics, np
+from graph_io import read_edge_arrays
+
+# Binary format: a little-endian header (magic, format version, flags, number of vertices v, number of edges e)
+# followed by 8-byte aligned sections: starts[e], ends[e], costs[e] and, when FLAG_CSR is set,
+# out_offsets[v + 1], in_offsets[v + 1], in_sources[e], in_ids[e] and present[v] (one byte per vertex).
+# All the integer sections are int64; the costs are int64, or float64 when FLAG_FLOAT_COSTS is set.
+BINARY_MAGIC = b"GRAPHCSR"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<8sIIqq")
+FLAG_CSR = 1
+FLAG_FLOAT_COSTS = 2
+
+
+def _index_typecode(limit):
+    """
+    complexity: θ(1)
+    Choose the smallest array typecode able to hold indices in the range [0, limit].
+
+    :param limit: The largest value that has to fit in the array.
+    :type limit: int
+    :return: 'i' for 32-bit signed indices, 'q' otherwise.
+    :rtype: str
+    """
+    return 'i' if limit < 2 ** 31 else 'q'
+
+
+def _write_array(file, values, typecode):
+    """
+    complexity: θ(n), where n - number of values
+    Write the values to a binary file as a little-endian array of the given typecode.
+
+    :param file: A file opened in binary mode.
+    :param values: The values to write (any sequence, or a NumPy array).
+    :param typecode: The typecode of the written items ('q' or 'd').
+    :type typecode: str
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        values.astype('<i8' if typecode == 'q' else '<f8', copy=False).tofile(file)
+        return
+    values = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+    if sys.byteorder != "little":
+        values = array(typecode, values)
+        values.byteswap()
+    values.tofile(file)
+
+
+def write_binary_edges(filename, vertices_counter, starts, ends, costs):
+    """
+    complexity: θ(e), where e - number of edges
+    Write three parallel edge sequences to a file in the binary format of CompactGraph.to_binary_file, without the
+    CSR sections (CompactGraph.from_binary_file builds them when it opens the file), so edges that do not come
+    from a graph are written without building one.
+
+    :param filename: The name of the binary graph file.
+    :type filename: str
+    :param vertices_counter: Number of vertices in the graph.
+    :type vertices_counter: int
+    :param starts: The start node of every edge.
+    :param ends: The end node of every edge.
+    :param costs: The integer cost of every edge.
+    """
+    with open(filename, "wb") as file:
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, vertices_counter, len(starts)))
+        _write_array(file, starts, 'q')
+        _write_array(file, ends, 'q')
+        _write_array(file, costs, 'q')
+
+
+def _close_mapping(mapping, views):
+    """
+    complexity: θ(1)
+    Release the memoryviews over a memory-mapped file and close the mapping, with the file handle it holds.
+    """
+    for view in reversed(views):
+        view.release()
+    mapping.close()
+
+
+def _cost_typecode(costs):
+    """
+    complexity: θ(e), where e - number of edges
+    Choose the array typecode for the costs: 'q' if every cost is an integer, 'd' otherwise.
+
+    :param costs: The costs of the edges.
+    :type costs: iterable
+    :rtype: str
+    """
+    return 'q' if all(isinstance(cost, int) for cost in costs) else 'd'
+
+
+class _AdjacencyView(Mapping):
+    """
+    Read-only dictionary-like view over one direction of a CompactGraph.
+
+    view[v] is a dictionary {neighbour: edge_id} built on demand from the row of v, so code written against
+    Graph.get_child_edges() / Graph.get_parent_edges() works without materializing the whole adjacency.
+    """
+
+    def __init__(self, compact, offsets, neighbours, edge_ids):
+        self.__compact = compact
+        self.__offsets = offsets
+        self.__neighbours = neighbours
+        self.__edge_ids = edge_ids
+
+    def __getitem__(self, v):
+        if not self.__compact.is_vertex(v):
+            raise KeyError(v)
+        lo, hi = self.__offsets[v], self.__offsets[v + 1]
+        if self.__edge_ids is None:
+            return dict(zip(self.__neighbours[lo:hi], range(lo, hi)))
+        return dict(zip(self.__neighbours[lo:hi], self.__edge_ids[lo:hi]))
+
+    def __iter__(self):
+        return iter(sorted(self.__compact.getter_for_all_vertices()))
+
+    def __len__(self):
+        return len(self.__compact.getter_for_all_vertices())
+
+    def __contains__(self, v):
+        return self.__compact.is_vertex(v)
+
+
+class _CSRRows:
+    """
+    Read-only list-like view over the rows of a CSR section: rows[v] is the slice values[offsets[v]:offsets[v + 1]],
+    or, when ids is given, the values at the positions ids[offsets[v]:offsets[v + 1]]. The rows are sliced from
+    the arrays of the compact graph on demand, so the indexed adjacency of a CompactGraph costs no memory.
+    """
+
+    def __init__(self, offsets, values, ids=None):
+        self.__offsets = offsets
+        self.__values = values
+        self.__ids = ids
+
+    def __getitem__(self, v):
+        lo, hi = self.__offsets[v], self.__offsets[v + 1]
+        if self.__ids is None:
+            return self.__values[lo:hi]
+        return [self.__values[i] for i in self.__ids[lo:hi]]
+
+    def __len__(self):
+        return len(self.__offsets) - 1
+
+
+class _IdentityIndex(Mapping):
+    """
+    Read-only dictionary-like view {vertex: dense index} of a CompactGraph, whose vertices already are the dense
+    indices 0..n-1: index[v] is v for every vertex of the graph.
+    """
+
+    def __init__(self, compact):
+        self.__compact = compact
+
+    def __getitem__(self, v):
+        if not self.__compact.is_vertex(v):
+            raise KeyError(v)
+        return v
+
+    def __iter__(self):
+        return iter(sorted(self.__compact.getter_for_all_vertices()))
+
+    def __len__(self):
+        return len(self.__compact.getter_for_all_vertices())
+
+    def __contains__(self, v):
+        return self.__compact.is_vertex(v)
+
+
+class CompactGraph:
+    def __init__(self, vertices_counter, present, out_offsets, out_targets, out_costs, in_offsets, in_sources,
+                 in_ids):
+        """
+        complexity: θ(1)
+        Initialize a frozen compressed sparse row (CSR) graph from already built arrays.
+        Use CompactGraph.from_graph or CompactGraph.from_file instead of calling this directly.
+
+        Vertices are the integers 0..n-1. The edges leaving v are stored at positions
+        out_offsets[v]..out_offsets[v + 1] - 1 of out_targets/out_costs, sorted by target; the position
+        of an edge in these arrays is its edge id. The edges entering v are stored at positions
+        in_offsets[v]..in_offsets[v + 1] - 1 of in_sources/in_ids, sorted by source, where in_ids holds
+        the id (out position) of each edge.
+
+        :param vertices_counter: Number of vertices in the graph.
+        :type vertices_counter: int
+        :param present: present[v] is 1 if v is a vertex of the graph, 0 otherwise.
+        :type present: bytearray
+        """
+        self.__vertices_counter = vertices_counter
+        self.__present = present
+        self.__out_offsets = out_offsets
+        self.__out_targets = out_targets
+        self.__out_costs = out_costs
+        self.__in_offsets = in_offsets
+        self.__in_sources = in_sources
+        self.__in_ids = in_ids
+        self.__vertices = None
+        self.__statistics = None
+        self.__negative_costs = None
+        self.__version = next_version()
+        # The memory-mapped file the arrays are views of, and these views (see from_binary_file and close)
+        self.__mapping = None
+        self.__views = []
+        self.visited = [False] * vertices_counter
+        self.originalVertex = 0
+        self.hamPathVertices = []
+        self.hamPathCost = 0
+
+    @classmethod
+    def from_edges(cls, vertices_counter, starts, ends, costs):
+        """
+        complexity: θ(v + e*log(d)), where v - number of vertices, e - number of edges, d - maximum out-degree
+        Build a compact graph from three parallel sequences describing the edges.
+
+        If the same (start, end) pair appears more than once, the last occurrence wins, as it does for
+        Graph.adder_of_edge_to_graph.
+
+        :param vertices_counter: Number of vertices in the graph.
+        :type vertices_counter: int
+        :param starts: The start node of every edge.
+        :param ends: The end node of every edge.
+        :param costs: The cost of every edge.
+        :return: The compact graph.
+        :rtype: CompactGraph
+        """
+        for v in (starts, ends):
+            for x in v:
+                if not isinstance(x, int) or x < 0:
+                    raise ValueError(f"CompactGraph only supports non-negative integer vertices, got {x!r}.")
+        n = max([vertices_counter, max(starts, default=-1) + 1, max(ends, default=-1) + 1])
+        present = bytearray(n)
+        for x in starts:
+            present[x] = 1
+        for x in ends:
+            present[x] = 1
+
+        # Counting sort of the edges by their start node
+        out_offsets = array(_index_typecode(len(starts)), [0]) * (n + 1)
+        for x in starts:
+            out_offsets[x + 1] += 1
+        for v in range(n):
+            out_offsets[v + 1] += out_offsets[v]
+        slots = array('q', out_offsets[:n])
+        order = array('q', [0]) * len(starts)
+        for i, x in enumerate(starts):
+            order[slots[x]] = i
+            slots[x] += 1
+
+        # Sort every row by target and drop the duplicated pairs (the last one wins)
+        kept = array('q')
+        for v in range(n):
+            row = sorted(order[out_offsets[v]:out_offsets[v + 1]], key=lambda i: (ends[i], i))
+            for k, i in enumerate(row):
+                if k + 1 == len(row) or ends[row[k + 1]] != ends[i]:
+                    kept.append(i)
+        if len(kept) != len(starts):
+            out_offsets = array(out_offsets.typecode, [0]) * (n + 1)
+            for i in kept:
+                out_offsets[starts[i] + 1] += 1
+            for v in range(n):
+                out_offsets[v + 1] += out_offsets[v]
+
+        e = len(kept)
+        out_targets = array(_index_typecode(n), (ends[i] for i in kept))
+        out_costs = array(_cost_typecode(costs), (costs[i] for i in kept))
+
+        # Counting sort of the kept edges by their end node; scanning them in (start, end) order keeps every
+        # inbound row sorted by source
+        in_offsets = array(_index_typecode(e), [0]) * (n + 1)
+        for y in out_targets:
+            in_offsets[y + 1] += 1
+        for v in range(n):
+            in_offsets[v + 1] += in_offsets[v]
+        slots = array('q', in_offsets[:n])
+        in_sources = array(_index_typecode(n), [0]) * e
+        in_ids = array(_index_typecode(e), [0]) * e
+        for x in range(n):
+            for edge_id in range(out_offsets[x], out_offsets[x + 1]):
+                y = out_targets[edge_id]
+                in_sources[slots[y]] = x
+                in_ids[slots[y]] = edge_id
+                slots[y] += 1
+
+        return cls(n, present, out_offsets, out_targets, out_costs, in_offsets, in_sources, in_ids)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        complexity: θ(v + e*log(d)), where v - number of vertices, e - number of edges, d - maximum out-degree
+        Build a compact graph holding the same vertices and edges as a Graph.
+        The edge ids are renumbered to their position in the compact arrays.
+
+        :param graph: The graph to compact.
+        :type graph: Graph
+        :rtype: CompactGraph
+        """
+        vertices = graph.getter_for_all_vertices()
+        for v in vertices:
+            if not isinstance(v, int) or v < 0:
+                raise ValueError(f"CompactGraph only supports non-negative integer vertices, got {v!r}.")
+        starts, ends, costs = [], [], []
+        child_edges = graph.get_child_edges()
+        for x in child_edges:
+            for y, edge_id in child_edges[x].items():
+                starts.append(x)
+                ends.append(y)
+                costs.append(graph.getter_the_cost_of_edge(edge_id))
+        compact = cls.from_edges(max(graph.getter_for_vertices_counter(), max(vertices, default=-1) + 1), starts,
+                                 ends, costs)
+        for v in vertices:
+            compact.__present[v] = 1
+        return compact
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        complexity: θ(v + e*log(d)), where v - number of vertices, e - number of edges, d - maximum out-degree
+        Build a compact graph straight from a file in the format used by Controller.read_graph_from_file,
+        without building the dictionary based Graph first.
+
+        :param filename: The name of the file from which to read the graph.
+        :type filename: str
+        :rtype: CompactGraph
+        """
+        return cls.from_edges(*read_edge_arrays(filename))
+
+    @classmethod
+    def from_binary_file(cls, filename):
+        """
+        complexity: θ(1) if the file holds the CSR sections, θ(v + e*log(d)) otherwise
+        Open a graph written by to_binary_file.
+
+        The file is memory-mapped and, when it holds the CSR sections, the arrays of the compact graph are
+        views over the mapping, so nothing is parsed or copied: the pages are loaded by the operating system
+        on first access. The mapping then stays open until close is called (or the graph is used as a context
+        manager); otherwise the arrays are copied and the mapping is closed before returning.
+
+        :param filename: The name of the binary graph file.
+        :type filename: str
+        :rtype: CompactGraph
+        """
+        with open(filename, "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        views = [view]
+        offset = BINARY_HEADER.size
+
+        def section(typecode, count):
+            nonlocal offset
+            end = offset + 8 * count
+            if end > len(view):
+                raise ValueError(f"{filename} is truncated.")
+            values = view[offset:end].cast(typecode)
+            views.append(values)
+            offset = end
+            if sys.byteorder != "little":
+                values = array(typecode, values)
+                values.byteswap()
+            return values
+
+        try:
+            if len(mapping) < BINARY_HEADER.size:
+                raise ValueError(f"{filename} is not a binary graph file.")
+            magic, version, flags, n, e = BINARY_HEADER.unpack_from(mapping, 0)
+            if magic != BINARY_MAGIC:
+                raise ValueError(f"{filename} is not a binary graph file.")
+            if version != BINARY_VERSION:
+                raise ValueError(f"{filename} uses the unsupported binary format version {version}.")
+            starts = section('q', e)
+            ends = section('q', e)
+            costs = section('d' if flags & FLAG_FLOAT_COSTS else 'q', e)
+            if flags & FLAG_CSR:
+                out_offsets = section('q', n + 1)
+                in_offsets = section('q', n + 1)
+                in_sources = section('q', e)
+                in_ids = section('q', e)
+                if offset + n > len(view):
+                    raise ValueError(f"{filename} is truncated.")
+                present = view[offset:offset + n]
+                views.append(present)
+                compact = cls(n, present, out_offsets, ends, costs, in_offsets, in_sources, in_ids)
+                compact.__mapping = mapping
+                compact.__views = views
+                return compact
+            # from_edges copies the edges into new arrays, so the mapping is no longer needed
+            compact = cls.from_edges(n, starts, ends, costs)
+        except BaseException:
+            _close_mapping(mapping, views)
+            raise
+        _close_mapping(mapping, views)
+        return compact
+
+    def close(self):
+        """
+        complexity: θ(1)
+        Close the memory-mapped file a graph opened by from_binary_file is a view of, with its file handle, which
+        keeps the file locked on Windows. The graph can no longer be queried afterwards. Closing a graph that
+        owns its arrays, or an already closed graph, does nothing.
+
+        :raises BufferError: If NumPy arrays over the file (see getter_edge_arrays) are still referenced.
+        """
+        if self.__mapping is not None:
+            _close_mapping(self.__mapping, self.__views)
+            self.__mapping = None
+            self.__views = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def to_binary_file(self, filename, with_csr=True):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Write the graph to a file in the versioned binary format read by from_binary_file.
+
+        :param filename: The name of the binary graph file.
+        :type filename: str
+        :param with_csr: If True, the prebuilt CSR offsets are written too, so the file can be opened without
+                         rebuilding them. Default value is True.
+        :type with_csr: bool
+        """
+        n, e = self.__vertices_counter, len(self.__out_targets)
+        costs = self.__out_costs
+        cost_typecode = 'd' if (costs.format if isinstance(costs, memoryview) else costs.typecode) == 'd' else 'q'
+        flags = (FLAG_CSR if with_csr else 0) | (FLAG_FLOAT_COSTS if cost_typecode == 'd' else 0)
+        starts = array('q')
+        for v in range(n):
+            starts.extend(array('q', [v]) * (self.__out_offsets[v + 1] - self.__out_offsets[v]))
+        with open(filename, "wb") as file:
+            file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, flags, n, e))
+            _write_array(file, starts, 'q')
+            _write_array(file, self.__out_targets, 'q')
+            _write_array(file, self.__out_costs, cost_typecode)
+            if with_csr:
+                _write_array(file, self.__out_offsets, 'q')
+                _write_array(file, self.__in_offsets, 'q')
+                _write_array(file, self.__in_sources, 'q')
+                _write_array(file, self.__in_ids, 'q')
+                file.write(bytes(self.__present))
+
+    def memory_usage(self):
+        """
+        complexity: θ(1)
+        Retrieve the number of bytes used by the arrays of the compact graph.
+
+        :rtype: int
+        """
+        arrays = (self.__out_offsets, self.__out_targets, self.__out_costs, self.__in_offsets, self.__in_sources,
+                  self.__in_ids)
+        return len(self.__present) + sum(a.itemsize * len(a) for a in arrays)
+
+    def is_vertex(self, v):
+        """
+        complexity: θ(1)
+        Check if v is a vertex of the graph.
+
+        :rtype: bool
+        """
+        return isinstance(v, int) and 0 <= v < len(self.__present) and self.__present[v] == 1
+
+    def getter_for_vertices_counter(self):
+        """
+        complexity: θ(1)
+        Get the number of vertices in the graph.
+
+        :rtype: int
+        """
+        return self.__vertices_counter
+
+    def getter_number_of_vertices(self):
+        """
+        complexity: θ(1)
+        Get the number of vertices in the graph.
+
+        :rtype: int
+        """
+        return self.__vertices_counter
+
+    def getter_number_of_edges(self):
+        """
+        complexity: θ(1)
+        Get the number of edges in the graph.
+
+        :rtype: int
+        """
+        return len(self.__out_targets)
+
+    def getter_for_all_vertices(self):
+        """
+        complexity: θ(v) for the first call, θ(1) afterwards, where v - number of vertices
+        Get the set of vertices in the graph.
+
+        :rtype: set
+        """
+        if self.__vertices is None:
+            self.__vertices = {v for v in range(len(self.__present)) if self.__present[v]}
+        return self.__vertices
+
+    def getter_vertex_labels(self):
+        """
+        complexity: θ(1)
+        Retrieve the interning table of the vertices, as Graph.getter_vertex_labels. The vertices of a compact
+        graph already are the integers 0..n-1, so the table is the identity; the integers that are not vertices
+        (see is_vertex) are left out of getter_vertex_index and have no edges.
+
+        :rtype: range
+        """
+        return range(len(self.__present))
+
+    def getter_vertex_index(self):
+        """
+        complexity: θ(1)
+        Retrieve the dense index of every vertex, as Graph.getter_vertex_index.
+
+        :rtype: Mapping
+        """
+        return _IdentityIndex(self)
+
+    def getter_indexed_adjacency(self):
+        """
+        complexity: θ(1)
+        Retrieve the outbound edges over the dense indices, as Graph.getter_indexed_adjacency, as views over the
+        CSR arrays (targets[v] and costs[v] are slices of out_targets and out_costs).
+
+        :rtype: tuple
+        """
+        return _CSRRows(self.__out_offsets, self.__out_targets), _CSRRows(self.__out_offsets, self.__out_costs)
+
+    def getter_indexed_inbound_adjacency(self):
+        """
+        complexity: θ(1)
+        Retrieve the inbound edges over the dense indices, as Graph.getter_indexed_inbound_adjacency, as views
+        over the CSR arrays.
+
+        :rtype: tuple
+        """
+        return (_CSRRows(self.__in_offsets, self.__in_sources),
+                _CSRRows(self.__in_offsets, self.__out_costs, self.__in_ids))
+
+    def getter_edge_arrays(self):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Retrieve the edges as three parallel arrays over the dense indices, as Graph.getter_edge_arrays. The ends
+        and the costs are the CSR arrays themselves (viewed as NumPy arrays when NumPy is installed); only the
+        starts are expanded from the offsets.
+
+        :rtype: tuple
+        """
+        n = len(self.__present)
+        if np is None:
+            starts = array('q')
+            for v in range(n):
+                starts.extend(array('q', [v]) * (self.__out_offsets[v + 1] - self.__out_offsets[v]))
+            return starts, self.__out_targets, self.__out_costs
+        starts = np.repeat(np.arange(n, dtype=np.int64), np.diff(np.asarray(self.__out_offsets)))
+        return starts, np.asarray(self.__out_targets), np.asarray(self.__out_costs)
+
+    def getter_statistics(self):
+        """
+        complexity: θ(v + e) for the first call, θ(1) afterwards, where v - number of vertices, e - number of edges
+        Retrieve the degrees, the cost sums, the degree histograms and the hubs of every vertex, as
+        Graph.getter_statistics.
+
+        :rtype: GraphStatistics
+        """
+        if self.__statistics is None:
+            self.__statistics = GraphStatistics(self.getter_vertex_labels(), self.__present, *self.getter_edge_arrays())
+        return self.__statistics
+
+    def has_self_loop(self, node):
+        """
+        complexity: θ(log(d)), where d - out-degree of node
+        Check if the specified node has a self-loop.
+
+        :rtype: bool
+        """
+        return self.getter_id_of_edge(node, node) != -1
+
+    def getter_id_of_edge(self, start_node, end_node):
+        """
+        complexity: θ(log(d)), where d - out-degree of start_node
+        Retrieve the ID of the edge between the specified start and end nodes.
+
+        :return: The ID of the edge, or -1 if the edge does not exist.
+        :rtype: int
+        """
+        if not self.is_vertex(start_node):
+            return -1
+        lo, hi = self.__out_offsets[start_node], self.__out_offsets[start_node + 1]
+        i = bisect_left(self.__out_targets, end_node, lo, hi)
+        if i < hi and self.__out_targets[i] == end_node:
+            return i
+        return -1
+
+    def checker_of_edge_existence(self, x, y):
+        """
+        complexity: θ(log(d)), where d - out-degree of x
+        :return: True if the edge (x, y) exists, False otherwise
+        """
+        return self.getter_id_of_edge(x, y) != -1
+
+    def getter_of_the_extremities_of_edge(self, edge_id):
+        """
+        complexity: θ(log(v)), where v - number of vertices
+        Retrieve the start and end nodes of the specified edge.
+
+        :return: A tuple (start_node, end_node), or (-1, -1) if the edge does not exist.
+        :rtype: tuple
+        """
+        if not isinstance(edge_id, int) or not 0 <= edge_id < len(self.__out_targets):
+            return -1, -1
+        start_node = bisect_left(self.__out_offsets, edge_id + 1) - 1
+        return start_node, self.__out_targets[edge_id]
+
+    def getter_the_cost_of_edge(self, edge_id):
+        """
+        complexity: θ(1)
+        Retrieve the cost associated with the specified edge.
+        """
+        return self.__out_costs[edge_id]
+
+    def getter_the_cost_of_edge_with_edges(self, _from, _to):
+        """
+        complexity: θ(log(d))
+        Retrieve the cost of the edge _from -> _to, or of the edge _to -> _from if the first one does not exist.
+        """
+        edge_id = self.getter_id_of_edge(_from, _to)
+        if edge_id == -1:
+            edge_id = self.getter_id_of_edge(_to, _from)
+        return self.__out_costs[edge_id]
+
+    def getter_version(self):
+        """
+        complexity: θ(1)
+        Get the version of the graph; a compact graph is frozen, so it keeps the version it got when it was built.
+
+        :rtype: int
+        """
+        return self.__version
+
+    def has_negative_costs(self):
+        """
+        complexity: θ(e) for the first call, θ(1) afterwards, where e - number of edges
+        Check if any edge of the graph has a negative cost.
+
+        :rtype: bool
+        """
+        if self.__negative_costs is None:
+            self.__negative_costs = any(cost < 0 for cost in self.__out_costs)
+        return self.__negative_costs
+
+    def get_costs(self):
+        """
+        complexity: θ(1)
+        Retrieve the costs of the edges, indexable by edge id.
+
+        :rtype: array
+        """
+        return self.__out_costs
+
+    def get_child_edges(self):
+        """
+        complexity: θ(1)
+        Retrieve a read-only view {start_node: {end_node: edge_id}} over the outbound edges of the graph.
+
+        :rtype: Mapping
+        """
+        return _AdjacencyView(self, self.__out_offsets, self.__out_targets, None)
+
+    def get_parent_edges(self):
+        """
+        complexity: θ(1)
+        Retrieve a read-only view {end_node: {start_node: edge_id}} over the inbound edges of the graph.
+
+        :rtype: Mapping
+        """
+        return _AdjacencyView(self, self.__in_offsets, self.__in_sources, self.__in_ids)
+
+    def getter_int_degree_of_vertex(self, vertex):
+        """
+        complexity: θ(1)
+        Retrieve the in-degree of the specified vertex.
+
+        :rtype: int
+        """
+        if not self.is_vertex(vertex):
+            return 0
+        return self.__in_offsets[vertex + 1] - self.__in_offsets[vertex]
+
+    def getter_out_degree_of_vertex(self, v):
+        """
+        complexity: θ(1)
+        Retrieve the out-degree of the specified vertex.
+
+        :rtype: int
+        """
+        if not self.is_vertex(v):
+            return 0
+        return self.__out_offsets[v + 1] - self.__out_offsets[v]
+
+    def getter_of_outbound_neighbours(self, v):
+        """
+        complexity: θ(d), where d - out-degree of v
+        Retrieve the sorted list of outbound neighbours of the specified vertex.
+
+        :rtype: list[int]
+        """
+        if not self.is_vertex(v):
+            return []
+        return self.__out_targets[self.__out_offsets[v]:self.__out_offsets[v + 1]].tolist()
+
+    def getter_inbound_neighbours_near_vertex(self, v):
+        """
+        complexity: θ(d), where d - in-degree of v
+        Retrieve the set of inbound neighbours of the specified vertex.
+
+        :rtype: set[int]
+        """
+        if not self.is_vertex(v):
+            return set()
+        return set(self.__in_sources[self.__in_offsets[v]:self.__in_offsets[v + 1]])
+
+    def get_outbound_neighbors_with_costs(self, node):
+        """
+        complexity: θ(d), where d - out-degree of node
+        Retrieve the outbound neighbors of the specified node along with the costs of the edges.
+
+        :rtype: list[(int, int or float)]
+        """
+        if not self.is_vertex(node):
+            return []
+        lo, hi = self.__out_offsets[node], self.__out_offsets[node + 1]
+        return list(zip(self.__out_targets[lo:hi], self.__out_costs[lo:hi]))
+
+    def get_all_neighbours(self, v):
+        """
+        complexity: θ(d*log(d)), where d - degree of v
+        Retrieve the sorted list of inbound and outbound neighbours of the specified vertex.
+
+        :rtype: list[int]
+        """
+        neighbours = set(self.getter_of_outbound_neighbours(v))
+        neighbours.update(self.getter_inbound_neighbours_near_vertex(v))
+        return sorted(neighbours)
@@ -0,0 +1,65 @@
+from array import array
+
+
+class DisjointSet:
+    def __init__(self, size):
+        """
+        complexity: θ(n), where n - number of elements
+        Initialize a disjoint-set (union-find) structure over the elements 0..size-1, each in its own set.
+
+        The parents and ranks are kept in flat arrays; find compresses the paths it walks and union links
+        the root of smaller rank under the other one, so every operation takes almost constant amortized time.
+
+        :param size: The number of elements.
+        :type size: int
+        """
+        self.__parent = array('q', range(size))
+        self.__rank = bytearray(size)
+        self.__sets_counter = size
+
+    def find(self, x):
+        """
+        complexity: O(α(n)) amortized
+        Find the representative of the set containing x.
+
+        :param x: The element.
+        :type x: int
+        :return: The representative element of the set of x.
+        :rtype: int
+        """
+        parent = self.__parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        """
+        complexity: O(α(n)) amortized
+        Merge the sets containing x and y.
+
+        :return: True if the sets were merged, False if x and y were already in the same set.
+        :rtype: bool
+        """
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        rank = self.__rank
+        if rank[x] < rank[y]:
+            x, y = y, x
+        self.__parent[y] = x
+        if rank[x] == rank[y]:
+            rank[x] += 1
+        self.__sets_counter -= 1
+        return True
+
+    def getter_number_of_sets(self):
+        """
+        complexity: θ(1)
+        Get the number of disjoint sets.
+
+        :rtype: int
+        """
+        return self.__sets_counter
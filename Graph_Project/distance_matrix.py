@@ -0,0 +1,76 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INFINITY = float("inf")
+# Above this number of vertices the v x v matrix of Floyd-Warshall gets too large, and Johnson's algorithm is used
+FLOYD_WARSHALL_MAX_VERTICES = 5000
+
+
+def new_distance_matrix(size, filename=None):
+    """
+    complexity: θ(size^2)
+    Allocate a size x size matrix of float costs, every entry set to INFINITY.
+
+    With NumPy the matrix is a float64 ndarray, stored in a .npy file mapped in memory (numpy.load(filename,
+    mmap_mode="r") maps it back) when filename is given. Without NumPy it is a list of array('d') rows.
+    Either way, matrix[i][j] is the entry of row i and column j.
+
+    :param size: The number of rows and columns.
+    :type size: int
+    :param filename: The name of the .npy file in which to store the matrix, or None to keep it in memory.
+                     Default value is None.
+    :type filename: str
+    :return: The matrix.
+    :raises ImportError: If filename is given and NumPy is not installed.
+    """
+    if np is None:
+        if filename is not None:
+            raise ImportError("NumPy is needed to store a distance matrix in a file.")
+        return [array('d', [INFINITY]) * size for _ in range(size)]
+    if filename is None:
+        return np.full((size, size), INFINITY)
+    matrix = np.lib.format.open_memmap(filename, mode="w+", dtype=np.float64, shape=(size, size))
+    matrix.fill(INFINITY)
+    return matrix
+
+
+def floyd_warshall(matrix, budget=None):
+    """
+    complexity: θ(v^3), where v - number of rows of the matrix
+    Run the Floyd-Warshall algorithm in place on a matrix of edge costs (INFINITY where there is no edge, 0 or
+    less on the diagonal), so that matrix[i][j] becomes the lowest cost of a walk from i to j.
+
+    With NumPy every intermediate vertex k is a single broadcast over the whole matrix,
+    matrix = minimum(matrix, matrix[:, k] + matrix[k, :]), instead of v^2 interpreted steps. Without NumPy the
+    rows are updated one at a time, skipping the rows that cannot reach k.
+
+    :param matrix: A matrix built by new_distance_matrix.
+    :param budget: The Budget charged for every intermediate vertex, or None for no limit; when it runs out, the
+                   matrix holds the lowest costs of the walks through the intermediate vertices done so far.
+                   Default value is None.
+    :type budget: Budget
+    :return: True if a negative cost cycle was found (a negative entry on the diagonal), False otherwise.
+    :rtype: bool
+    """
+    size = len(matrix)
+    if np is not None:
+        for k in range(size):
+            if budget is not None and not budget.spend():
+                break
+            np.minimum(matrix, matrix[:, k, np.newaxis] + matrix[np.newaxis, k, :], out=matrix)
+        return bool((matrix.diagonal() < 0).any())
+    for k in range(size):
+        if budget is not None and not budget.spend():
+            break
+        row_k = matrix[k]
+        for i in range(size):
+            row_i = matrix[i]
+            cost_ik = row_i[k]
+            if cost_ik == INFINITY:
+                continue
+            matrix[i] = array('d', map(min, row_i, [cost_ik + cost_kj for cost_kj in row_k]))
+    return any(matrix[i][i] < 0 for i in range(size))
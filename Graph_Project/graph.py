@@ -1,15 +1,84 @@
-import copy
+import itertools
+
+from graph_statistics import GraphStatistics, edge_arrays_from_rows, np
+
+# Versions are drawn from a single counter shared by every graph, so that a version identifies one state of one
+# graph: a new graph, or a graph replaced in the Controller, never reuses the version of another one
+_versions = itertools.count()
+
+
+def next_version():
+    """
+    complexity: θ(1)
+    Get a version never returned before, for a new or modified graph.
+
+    :rtype: int
+    """
+    return next(_versions)
+
+
+def vertex_sort_key(vertex):
+    """
+    complexity: θ(1)
+    Sort key of the vertices in the sorted views of a graph: the vertices are ordered by value within each type,
+    so graphs mixing labels of different types (int and str) can still be sorted.
+
+    :rtype: tuple
+    """
+    return type(vertex).__name__, vertex
+
+
+def edge_rows(edges, widths=(3,)):
+    """
+    complexity: θ(e), where e - number of edges
+    Read the edges given to the bulk methods of a graph (see Graph.add_edges_bulk) as rows of Python values: an
+    iterable of rows, an e x w NumPy array, or a tuple of w NumPy arrays (one per column, like the result of
+    Graph.getter_edge_arrays). The vertex columns of a NumPy float array must hold integers, and are read as int.
+
+    :param widths: The accepted widths w of the rows: 3 for (start_node, end_node, cost) rows, 2 for
+                   (start_node, end_node) rows. Default value is (3,).
+    :type widths: tuple
+    :return: The rows, or edges itself if it is not made of NumPy arrays.
+    :raises ValueError: If the arrays do not have the expected shape, or a vertex column holds non integers.
+    """
+    if np is None:
+        return edges
+    if isinstance(edges, np.ndarray):
+        if edges.ndim != 2 or edges.shape[1] not in widths:
+            raise ValueError(f"Expected an array of shape (e, {' or '.join(map(str, widths))}), got {edges.shape}.")
+        columns = list(edges.T)
+    elif isinstance(edges, tuple) and len(edges) in widths and all(isinstance(c, np.ndarray) for c in edges):
+        columns = [np.asarray(c) for c in edges]
+        if any(c.ndim != 1 or len(c) != len(columns[0]) for c in columns):
+            raise ValueError("Expected one dimensional arrays of the same length.")
+    else:
+        return edges
+    for i in (0, 1):
+        if columns[i].dtype.kind == 'f':
+            if not np.all(np.mod(columns[i], 1) == 0):
+                raise ValueError("The vertices of a float array must be integers.")
+            columns[i] = columns[i].astype(np.int64)
+    return list(zip(*(c.tolist() for c in columns)))
+
+
+# The previous value of a dictionary entry that did not exist, in the undo log of the snapshots
+_MISSING = object()
+# The default snapshot name, used by getter_of_copy_of_graph and set_copy_of_graph
+DEFAULT_SNAPSHOT = "copy"
 
 
 class Graph:
-    def __init__(self, vertices_counter=0, copies=None):
+    def __init__(self, vertices_counter=0, *, recycle_edge_ids=False):
         """
         complexity: θ(1)
         Initialize a graph object.
 
-        :type copies: object
         :param vertices_counter: Number of vertices in the graph. Default value is 0.
         :type vertices_counter: int
+        :param recycle_edge_ids: If True, the IDs of removed edges are reused by later insertions. Keyword-only, so
+                                 that it cannot be passed in the slot of the removed copies argument. Default value is
+                                 False.
+        :type recycle_edge_ids: bool
 
         This constructor initializes the following fields:
         - self.__vertices_counter: Number of vertices in the graph.
@@ -17,6 +86,22 @@ class Graph:
         - self.__out_edges: Dictionary that stores inbound edges of a vertex.
         - self.__in_edges: Dictionary that stores outbound edges of a vertex.
         - self.__edges_expense: Dictionary that stores the cost of an edge.
+        - self.__edges_extremities: Dictionary that stores the (start, end) nodes of an edge.
+        - self.__next_edge_id: The next never used edge ID; edge IDs are allocated independently of the number of edges.
+        - self.__free_edge_ids: IDs of removed edges waiting to be reused (only when recycle_edge_ids is True).
+        - self.__negative_costs: Number of edges with a negative cost.
+        - self.__version: Version of the graph, replaced by a new one (see next_version) on every mutation.
+        - self.__child_edges_view, self.__parent_edges_view: Cached sorted adjacency views, rebuilt only when the
+          set of vertices changes.
+        - self.__vertex_labels, self.__vertex_index: Interning table between the vertices and the dense indices
+          0..v-1 used by the algorithms, built on first use and then kept up to date by every mutation.
+        - self.__indexed_out, self.__indexed_in: [neighbours, costs] adjacency lists over the dense indices, in
+          both directions, built on first use and then patched by every mutation.
+        - self.__statistics: Cached (version, GraphStatistics) of the last getter_statistics call.
+        - self.__undo_log: While snapshots exist, the list of (dictionary, key, previous value) records of every
+          change made to the dictionaries since the oldest snapshot; None otherwise.
+        - self.__snapshots: Dictionary mapping the name of every snapshot to its position in the undo log and the
+          counters of the graph when it was taken.
         """
         self.__vertices_counter = vertices_counter
         self.visited = [False] * vertices_counter
@@ -27,7 +112,74 @@ class Graph:
         self.__out_edges = {}
         self.__in_edges = {}
         self.__edges_expense = {}
-        self.__copy = copies
+        self.__edges_extremities = {}
+        self.__next_edge_id = 0
+        self.__free_edge_ids = []
+        self.__recycle_edge_ids = recycle_edge_ids
+        self.__negative_costs = 0
+        self.__version = next_version()
+        self.__child_edges_view = None
+        self.__parent_edges_view = None
+        self.__vertex_labels = None
+        self.__vertex_index = None
+        self.__indexed_out = None
+        self.__indexed_in = None
+        self.__statistics = None
+        self.__undo_log = None
+        self.__snapshots = {}
+
+    def getter_version(self):
+        """
+        complexity: θ(1)
+        Get the version of the graph, which is increased on every mutation.
+        Two equal versions mean the same graph object, unchanged in between.
+
+        :rtype: int
+        """
+        return self.__version
+
+    def __mutated(self, vertices_changed=False):
+        """
+        complexity: θ(1)
+        Record a mutation of the graph: increase the version and, if the set of vertices changed, drop the
+        cached adjacency views. Edge insertions and removals only touch the inner dictionaries, which the
+        cached views share, so they stay valid without being rebuilt.
+
+        :param vertices_changed: True if vertices were added or removed, or the adjacency dictionaries replaced.
+        :type vertices_changed: bool
+        """
+        self.__version = next_version()
+        if vertices_changed:
+            self.__child_edges_view = None
+            self.__parent_edges_view = None
+
+    def __record(self, dictionary, key):
+        """
+        complexity: θ(1)
+        Record the current value of dictionary[key] in the undo log, before it is set or deleted, if snapshots exist.
+        """
+        if self.__undo_log is not None:
+            self.__undo_log.append((dictionary, key, dictionary.get(key, _MISSING)))
+
+    def has_negative_costs(self):
+        """
+        complexity: θ(1)
+        Check if any edge of the graph has a negative cost.
+
+        :rtype: bool
+        """
+        return self.__negative_costs > 0
+
+    def __cost_replaced(self, edge_id, cost):
+        """
+        complexity: θ(1)
+        Keep the number of negative cost edges up to date before the cost of a live edge is replaced.
+
+        :param edge_id: The ID of the edge whose cost is replaced.
+        :param cost: The new cost of the edge.
+        """
+        if edge_id in self.__edges_extremities:
+            self.__negative_costs += (cost < 0) - (self.__edges_expense[edge_id] < 0)
 
     def get_costs(self):
         return self.__edges_expense
@@ -46,6 +198,7 @@ class Graph:
         This method updates the number of vertices in the graph with the specified value.
         """
         self.__vertices_counter = vertices_counter
+        self.__mutated()
 
     def getter_for_vertices_counter(self):
         """
@@ -91,16 +244,17 @@ class Graph:
         This method updates the number of edges in the graph with the specified value.
         """
         self.__edges_counter = edges_counter
+        self.__mutated()
 
     def getter_of_the_extremities_of_edge(self, edge_id):
         """
-        complexity: θ(v*e), where v - number of vertices, e - number of edges
+        complexity: θ(1)
         Retrieve the start and end nodes of the specified edge.
 
         :param edge_id: The ID of the edge for which we want to retrieve the start and end nodes.
         :type edge_id: int
 
-        This method iterates through the outbound edges of each vertex to find the specified edge ID.
+        This method looks the specified edge ID up in the edge_id -> (start_node, end_node) index.
         If the edge ID is found, the method returns a tuple (start_node, end_node) representing the start and end nodes of the edge.
         If the edge does not exist, the method returns a tuple (-1, -1).
 
@@ -108,11 +262,7 @@ class Graph:
                  or (-1, -1) if the edge does not exist.
         :rtype: tuple
         """
-        for start_node, child_edges in self.__in_edges.items():
-            for end_node, current_edge_id in child_edges.items():
-                if current_edge_id == edge_id:
-                    return start_node, end_node
-        return -1, -1
+        return self.__edges_extremities.get(edge_id, (-1, -1))
 
     def getter_id_of_edge(self, start_node, end_node):
         """
@@ -130,6 +280,40 @@ class Graph:
             return self.__in_edges[start_node][end_node]
         return -1
 
+    def getter_edge_id_bound(self):
+        """
+        complexity: θ(1)
+        Retrieve an upper bound for the edge IDs: every ID ever allocated is smaller than it.
+        Arrays indexed by edge ID can be sized with it.
+
+        :return: The smallest integer larger than every allocated edge ID.
+        :rtype: int
+        """
+        return self.__next_edge_id
+
+    def __allocate_edge_id(self):
+        """
+        complexity: θ(1) amortized
+        Allocate the ID of a new edge: a recycled ID if one is available, the next never used ID otherwise.
+
+        :rtype: int
+        """
+        if self.__free_edge_ids:
+            return self.__free_edge_ids.pop()
+        edge_id = self.__next_edge_id
+        self.__next_edge_id += 1
+        return edge_id
+
+    def __release_edge_id(self, edge_id):
+        """
+        complexity: θ(1) amortized
+        Release the ID of a removed edge, so it can be reused if recycling is enabled.
+
+        :type edge_id: int
+        """
+        if self.__recycle_edge_ids:
+            self.__free_edge_ids.append(edge_id)
+
     def getter_number_of_vertices(self):
         """
         complexity: O(1)
@@ -152,23 +336,284 @@ class Graph:
 
     def get_child_edges(self):
         """
-        complexity: O(v), where v - number of vertices
+        complexity: θ(1) if the set of vertices did not change since the last call, O(v*log(v)) otherwise,
+        where v - number of vertices
         Retrieve the outbound edges of the graph.
+        The returned dictionary is cached and shared between calls, so it must not be modified.
 
         :return: A dictionary containing the outbound edges of the graph, sorted by keys.
         :rtype: dict
         """
-        return dict(sorted(self.__in_edges.items()))
+        if self.__child_edges_view is None:
+            self.__child_edges_view = dict(sorted(self.__in_edges.items(), key=lambda item: vertex_sort_key(item[0])))
+        return self.__child_edges_view
 
     def get_parent_edges(self):
         """
-        complexity: O(v), where v- number of vertices
+        complexity: θ(1) if the set of vertices did not change since the last call, O(v*log(v)) otherwise,
+        where v - number of vertices
         Retrieve the inbound edges of the graph.
+        The returned dictionary is cached and shared between calls, so it must not be modified.
 
         :return: A dictionary containing the inbound edges of the graph, sorted by keys.
         :rtype: dict
         """
-        return dict(sorted(self.__out_edges.items()))
+        if self.__parent_edges_view is None:
+            self.__parent_edges_view = dict(sorted(self.__out_edges.items(), key=lambda item: vertex_sort_key(item[0])))
+        return self.__parent_edges_view
+
+    def getter_vertex_labels(self):
+        """
+        complexity: θ(1) amortized, θ(v) the first time, where v - number of vertices
+        Retrieve the interning table of the vertices: the vertex whose dense index is i is at position i.
+        The algorithms work on arrays indexed by the dense indices 0..v-1, whatever the vertices are (large or
+        sparse integers, strings, or a mix of them), and translate the indices back to vertices only in their
+        results.
+
+        The indices are given in insertion order and kept up to date by every mutation: a new vertex gets the
+        next index, and removing a vertex moves the vertex with the last index to the freed one.
+        The returned list is shared with the graph, so it must not be modified.
+
+        :return: The list of the vertices of the graph, in the order of their indices.
+        :rtype: list
+        """
+        if self.__vertex_labels is None:
+            self.__vertex_labels = list(self.__in_edges)
+            self.__vertex_index = {vertex: i for i, vertex in enumerate(self.__vertex_labels)}
+        return self.__vertex_labels
+
+    def getter_vertex_index(self):
+        """
+        complexity: θ(1) amortized, θ(v) the first time, where v - number of vertices
+        Retrieve the dense index of every vertex, the inverse of getter_vertex_labels.
+        The returned dictionary is shared with the graph, so it must not be modified.
+
+        :return: A dictionary {vertex: index}.
+        :rtype: dict
+        """
+        self.getter_vertex_labels()
+        return self.__vertex_index
+
+    def __build_indexed_adjacency(self, edges):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Translate one direction of the adjacency dictionaries ({vertex: {neighbour: edge_id}}) to lists over the
+        dense indices.
+
+        :return: A list [neighbours, costs] of two lists of v lists.
+        :rtype: list
+        """
+        index = self.getter_vertex_index()
+        expense = self.__edges_expense
+        return [[[index[y] for y in edges[x]] for x in self.__vertex_labels],
+                [[expense[edge_id] for edge_id in edges[x].values()] for x in self.__vertex_labels]]
+
+    def getter_indexed_adjacency(self):
+        """
+        complexity: θ(1) amortized, θ(v + e) the first time, where v - number of vertices, e - number of edges
+        Retrieve the outbound edges of the graph over the dense indices of getter_vertex_index.
+        Once built, the lists are patched by every mutation instead of being rebuilt, so the queries that follow a
+        change of the graph do not pay for the whole adjacency again. They are shared with the graph, so they
+        must not be modified.
+
+        :return: A tuple (targets, costs) of lists of v lists: targets[i] holds the indices of the outbound
+                 neighbours of the vertex of index i, in the order the edges were added, and costs[i] the costs of
+                 the edges to them.
+        :rtype: tuple
+        """
+        if self.__indexed_out is None:
+            self.__indexed_out = self.__build_indexed_adjacency(self.__in_edges)
+        return self.__indexed_out[0], self.__indexed_out[1]
+
+    def getter_indexed_inbound_adjacency(self):
+        """
+        complexity: θ(1) amortized, θ(v + e) the first time, where v - number of vertices, e - number of edges
+        Retrieve the inbound edges of the graph over the dense indices of getter_vertex_index, kept up to date
+        like getter_indexed_adjacency.
+
+        :return: A tuple (sources, costs) of lists of v lists: sources[i] holds the indices of the inbound
+                 neighbours of the vertex of index i, and costs[i] the costs of the edges from them.
+        :rtype: tuple
+        """
+        if self.__indexed_in is None:
+            self.__indexed_in = self.__build_indexed_adjacency(self.__out_edges)
+        return self.__indexed_in[0], self.__indexed_in[1]
+
+    def getter_edge_arrays(self):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Retrieve the edges of the graph as three parallel arrays over the dense indices of the vertices (see
+        getter_vertex_labels), for vectorized computations: NumPy arrays when NumPy is installed.
+
+        :return: A tuple (starts, ends, costs), with one entry per edge.
+        :rtype: tuple
+        """
+        return edge_arrays_from_rows(*self.getter_indexed_adjacency())
+
+    def getter_statistics(self):
+        """
+        complexity: θ(1) if the graph did not change since the last call, θ(v + e) otherwise,
+        where v - number of vertices, e - number of edges
+        Retrieve the degrees, the cost sums, the degree histograms and the hubs of every vertex, computed in one
+        vectorized pass over getter_edge_arrays instead of a degree query per vertex.
+
+        :rtype: GraphStatistics
+        """
+        if self.__statistics is None or self.__statistics[0] != self.__version:
+            labels = self.getter_vertex_labels()
+            statistics = GraphStatistics(labels, [True] * len(labels), *self.getter_edge_arrays())
+            self.__statistics = (self.__version, statistics)
+        return self.__statistics[1]
+
+    def __drop_indexes(self):
+        """
+        complexity: θ(1)
+        Drop the interning table and the indexed adjacency lists, rebuilt on their next use; needed when the
+        adjacency dictionaries are replaced or restored wholesale.
+        """
+        self.__vertex_labels = None
+        self.__vertex_index = None
+        self.__indexed_out = None
+        self.__indexed_in = None
+
+    def __index_vertex_added(self, v):
+        """
+        complexity: θ(1) amortized
+        Give the next dense index to a new vertex, if the interning table is built.
+        """
+        if self.__vertex_labels is None:
+            return
+        self.__vertex_index[v] = len(self.__vertex_labels)
+        self.__vertex_labels.append(v)
+        for adjacency in (self.__indexed_out, self.__indexed_in):
+            if adjacency is not None:
+                adjacency[0].append([])
+                adjacency[1].append([])
+
+    def __index_vertex_removed(self, v):
+        """
+        complexity: θ(d), where d - sum of the degrees of the neighbours of the vertex that takes the index of v
+        Free the dense index of a removed vertex (whose edges were already removed from the adjacency lists), by
+        moving the vertex with the last index to it.
+        """
+        if self.__vertex_labels is None:
+            return
+        labels = self.__vertex_labels
+        index = self.__vertex_index
+        freed = index.pop(v)
+        last = len(labels) - 1
+        moved = labels.pop()
+        for adjacency in (self.__indexed_out, self.__indexed_in):
+            if adjacency is not None:
+                for rows in adjacency:
+                    rows[freed] = rows[last]
+                    rows.pop()
+        if freed == last:
+            return
+        labels[freed] = moved
+        index[moved] = freed
+        # The neighbours of the moved vertex refer to it by its old index
+        for adjacency, neighbours in ((self.__indexed_out, self.__out_edges[moved]),
+                                      (self.__indexed_in, self.__in_edges[moved])):
+            if adjacency is not None:
+                for neighbour in neighbours:
+                    row = adjacency[0][index[neighbour]]
+                    row[row.index(last)] = freed
+
+    def __index_edge_added(self, start_node, end_node, cost):
+        """
+        complexity: θ(1) amortized
+        Append a new edge to the indexed adjacency lists that are built.
+        """
+        if self.__indexed_out is not None:
+            i = self.__vertex_index[start_node]
+            self.__indexed_out[0][i].append(self.__vertex_index[end_node])
+            self.__indexed_out[1][i].append(cost)
+        if self.__indexed_in is not None:
+            i = self.__vertex_index[end_node]
+            self.__indexed_in[0][i].append(self.__vertex_index[start_node])
+            self.__indexed_in[1][i].append(cost)
+
+    def __index_edge_changed(self, start_node, end_node, cost=_MISSING):
+        """
+        complexity: θ(d), where d - out-degree of start_node plus in-degree of end_node
+        Set the cost of an edge in the indexed adjacency lists that are built, or remove the edge from them when
+        no cost is given.
+        """
+        for adjacency, x, y in ((self.__indexed_out, start_node, end_node), (self.__indexed_in, end_node, start_node)):
+            if adjacency is not None:
+                i = self.__vertex_index[x]
+                neighbours, costs = adjacency[0][i], adjacency[1][i]
+                position = neighbours.index(self.__vertex_index[y])
+                if cost is _MISSING:
+                    del neighbours[position]
+                    del costs[position]
+                else:
+                    costs[position] = cost
+
+    def __index_edges_added(self, vertices, added, changed):
+        """
+        complexity: θ(n + e + d), where n - number of new vertices, e - number of new edges, d - sum of the
+        degrees of the extremities of the edges whose cost changed
+        Patch the interning table and the indexed adjacency lists that are built after a batch of insertions (see
+        add_edges_bulk), in the order the vertices and the edges were added to the dictionaries.
+
+        :param vertices: The new vertices.
+        :type vertices: iterable
+        :param added: The (start_node, end_node, cost) triples of the new edges.
+        :type added: list
+        :param changed: The (start_node, end_node, cost) triples of the existing edges that got a new cost.
+        :type changed: list
+        """
+        if self.__vertex_labels is None:
+            return
+        labels = self.__vertex_labels
+        index = self.__vertex_index
+        first = len(labels)
+        labels.extend(vertices)
+        for i in range(first, len(labels)):
+            index[labels[i]] = i
+        for adjacency, x, y in ((self.__indexed_out, 0, 1), (self.__indexed_in, 1, 0)):
+            if adjacency is None:
+                continue
+            neighbours, costs = adjacency
+            for _ in range(first, len(labels)):
+                neighbours.append([])
+                costs.append([])
+            for edge in added:
+                i = index[edge[x]]
+                neighbours[i].append(index[edge[y]])
+                costs[i].append(edge[2])
+        for start_node, end_node, cost in changed:
+            self.__index_edge_changed(start_node, end_node, cost)
+
+    def __index_edges_removed(self, removed):
+        """
+        complexity: θ(r + d), where r - number of removed edges, d - sum of the degrees of their extremities
+        Remove many edges from the indexed adjacency lists that are built (see remove_edges_bulk).
+
+        :param removed: The (start_node, end_node) pairs of the removed edges.
+        :type removed: list
+        """
+        for adjacency, x, y in ((self.__indexed_out, 0, 1), (self.__indexed_in, 1, 0)):
+            if adjacency is None:
+                continue
+            index = self.__vertex_index
+            neighbours, costs = adjacency
+            lost = {}
+            for edge in removed:
+                lost.setdefault(index[edge[x]], []).append(index[edge[y]])
+            for i, gone in lost.items():
+                if len(gone) == 1:
+                    position = neighbours[i].index(gone[0])
+                    del neighbours[i][position]
+                    del costs[i][position]
+                    continue
+                # Several edges leave the same row: filter it once instead of searching it once per edge
+                gone = set(gone)
+                kept = [k for k, j in enumerate(neighbours[i]) if j not in gone]
+                costs[i][:] = [costs[i][k] for k in kept]
+                neighbours[i][:] = [neighbours[i][k] for k in kept]
 
     def getter_int_degree_of_vertex(self, vertex):
         """
@@ -191,8 +636,8 @@ class Graph:
         :rtype: list[(int or str, float)]
         """
         outbound_neighbors_with_costs = []
-        if node in self.__out_edges:
-            for neighbor, edge_id in self.__out_edges[node].items():
+        if node in self.__in_edges:
+            for neighbor, edge_id in self.__in_edges[node].items():
                 cost = self.__edges_expense[edge_id]
                 outbound_neighbors_with_costs.append((neighbor, cost))
         return outbound_neighbors_with_costs
@@ -218,7 +663,7 @@ class Graph:
         :rtype: set[int]
         """
         if v in self.__in_edges:
-            return sorted(set(self.__in_edges[v].keys()))
+            return sorted(set(self.__in_edges[v].keys()), key=vertex_sort_key)
         else:
             return []
 
@@ -228,7 +673,7 @@ class Graph:
             inbound_neighbours.update(self.__in_edges[v].keys())
         if v in self.__out_edges:
             inbound_neighbours.update(self.__out_edges[v].keys())
-        return sorted(inbound_neighbours)
+        return sorted(inbound_neighbours, key=vertex_sort_key)
 
     def getter_inbound_neighbours_near_vertex(self, v):
         """
@@ -277,7 +722,12 @@ class Graph:
         :param cost: The cost to be set for the specified edge.
         :type cost: float
         """
+        self.__cost_replaced(edge_id, cost)
+        self.__record(self.__edges_expense, edge_id)
         self.__edges_expense[edge_id] = cost
+        if edge_id in self.__edges_extremities:
+            self.__index_edge_changed(*self.__edges_extremities[edge_id], cost)
+        self.__mutated()
 
     def checker_of_edge_existence(self, x, y):
         """
@@ -298,8 +748,12 @@ class Graph:
         :type v: int or str
         """
         if v not in self.__out_edges:
+            self.__record(self.__out_edges, v)
+            self.__record(self.__in_edges, v)
             self.__out_edges[v] = {}
             self.__in_edges[v] = {}
+            self.__index_vertex_added(v)
+            self.__mutated(vertices_changed=True)
 
     def remover_of_vertex_from_graph(self, v):
         """
@@ -324,24 +778,43 @@ class Graph:
             # Deleting parent edges
             parent_edges_copy = dict(self.__out_edges[v])
             for x in parent_edges_copy:
+                self.__negative_costs -= self.__edges_expense[parent_edges_copy[x]] < 0
+                self.__record(self.__edges_expense, parent_edges_copy[x])
+                self.__record(self.__edges_extremities, parent_edges_copy[x])
+                self.__record(self.__in_edges[x], v)
                 del self.__edges_expense[parent_edges_copy[x]]
+                del self.__edges_extremities[parent_edges_copy[x]]
+                self.__release_edge_id(parent_edges_copy[x])
                 del self.__in_edges[x][v]
+                self.__index_edge_changed(x, v)
 
             # Deleting child edges
             child_edges_copy = dict(self.__in_edges[v])
             for x in child_edges_copy:
+                self.__negative_costs -= self.__edges_expense[child_edges_copy[x]] < 0
+                self.__record(self.__edges_expense, child_edges_copy[x])
+                self.__record(self.__edges_extremities, child_edges_copy[x])
+                self.__record(self.__out_edges[x], v)
                 del self.__edges_expense[child_edges_copy[x]]
+                del self.__edges_extremities[child_edges_copy[x]]
+                self.__release_edge_id(child_edges_copy[x])
                 del self.__out_edges[x][v]
+                self.__index_edge_changed(v, x)
 
             # Deleting vertex
+            self.__record(self.__out_edges, v)
+            self.__record(self.__in_edges, v)
             del self.__out_edges[v]
             del self.__in_edges[v]
+            self.__index_vertex_removed(v)
+            self.__mutated(vertices_changed=True)
 
     def adder_of_edge_to_graph(self, start_node, end_node, cost):
         """
         Add an edge to the graph between the specified start and end nodes with the given cost.
 
         If the start or end nodes do not exist in the graph, they will be added.
+        If the edge already exists, it keeps its ID and only its cost is updated.
 
         :param start_node: The start node of the edge.
         :type start_node: int or str
@@ -349,13 +822,184 @@ class Graph:
         :type end_node: int or str
         :param cost: The cost associated with the edge.
         :type cost: float
+        :return: The ID of the edge.
+        :rtype: int
         """
         self.adder_of_vertex_into_graph(start_node)
         self.adder_of_vertex_into_graph(end_node)
-        self.__out_edges[end_node][start_node] = self.__edges_counter
-        self.__in_edges[start_node][end_node] = self.__edges_counter
-        self.__edges_expense[self.__edges_counter] = cost
+        if end_node in self.__in_edges[start_node]:
+            edge_id = self.__in_edges[start_node][end_node]
+            self.__cost_replaced(edge_id, cost)
+            self.__record(self.__edges_expense, edge_id)
+            self.__edges_expense[edge_id] = cost
+            self.__index_edge_changed(start_node, end_node, cost)
+            self.__mutated()
+            return edge_id
+        edge_id = self.__allocate_edge_id()
+        self.__record(self.__out_edges[end_node], start_node)
+        self.__record(self.__in_edges[start_node], end_node)
+        self.__record(self.__edges_expense, edge_id)
+        self.__record(self.__edges_extremities, edge_id)
+        self.__out_edges[end_node][start_node] = edge_id
+        self.__in_edges[start_node][end_node] = edge_id
+        self.__edges_expense[edge_id] = cost
+        self.__edges_extremities[edge_id] = (start_node, end_node)
+        self.__negative_costs += cost < 0
         self.__edges_counter += 1
+        self.__index_edge_added(start_node, end_node, cost)
+        self.__mutated()
+        return edge_id
+
+    def __edge_batch(self, edges, widths, allow_duplicates=True):
+        """
+        complexity: θ(e), where e - number of edges
+        Validate the edges given to add_edges_bulk or remove_edges_bulk in one pass, before the graph is changed.
+
+        :param widths: The accepted lengths of the rows (see edge_rows).
+        :type widths: tuple
+        :return: The list of the rows.
+        :rtype: list
+        :raises ValueError: If a row has the wrong length, or if allow_duplicates is False and an edge is given
+                            twice or already exists.
+        """
+        rows = edge_rows(edges, widths)
+        if not isinstance(rows, list):
+            rows = list(rows)
+        for row in rows:
+            try:
+                width = len(row)
+            except TypeError:
+                width = None
+            if width not in widths:
+                raise ValueError(f"Expected {'a (start, end, cost) triple' if widths == (3,) else 'a (start, end) pair'}"
+                                 f", got {row!r}.")
+        if not allow_duplicates:
+            in_edges = self.__in_edges
+            seen = set()
+            for row in rows:
+                key = row[0], row[1]
+                if key in seen or row[1] in in_edges.get(row[0], ()):
+                    raise ValueError(f"The edge ({row[0]}, {row[1]}) is given twice or already exists.")
+                seen.add(key)
+        return rows
+
+    def add_edges_bulk(self, edges, allow_duplicates=True):
+        """
+        complexity: θ(e), where e - number of edges to add
+        Add many edges at once, given as (start_node, end_node, cost) rows (see edge_rows for the NumPy arrays that
+        are accepted).
+
+        Behaves like calling adder_of_edge_to_graph for every row, but the rows are validated in one pass before the
+        graph is changed, then written straight into the adjacency dictionaries, and the counters, the cached views,
+        the indexed adjacency lists and the version are updated once at the end.
+
+        :param edges: The edges to add.
+        :type edges: iterable of (int or str, int or str, float), or NumPy arrays
+        :param allow_duplicates: If False, raise ValueError, leaving the graph unchanged, when an edge is given twice
+                                 or already exists. Otherwise such an edge only gets the last cost given (default).
+        :type allow_duplicates: bool
+        :return: The number of new edges.
+        :rtype: int
+        :raises ValueError: If a row is not a triple, or on a duplicate edge if allow_duplicates is False.
+        """
+        rows = self.__edge_batch(edges, (3,), allow_duplicates)
+        if self.__undo_log is not None:
+            # While snapshots exist, every change has to be recorded, as adder_of_edge_to_graph does
+            edges_before = self.__edges_counter
+            for start_node, end_node, cost in rows:
+                self.adder_of_edge_to_graph(start_node, end_node, cost)
+            return self.__edges_counter - edges_before
+        out_edges = self.__out_edges
+        in_edges = self.__in_edges
+        expense = self.__edges_expense
+        extremities = self.__edges_extremities
+        vertices_before = len(out_edges)
+
+        negative_costs = 0
+        free_edge_ids = self.__free_edge_ids
+        next_edge_id = self.__next_edge_id
+        added = []
+        changed = []
+        for start_node, end_node, cost in rows:
+            children = in_edges.get(start_node)
+            if children is None:
+                children = in_edges[start_node] = {}
+                out_edges[start_node] = {}
+            parents = out_edges.get(end_node)
+            if parents is None:
+                parents = out_edges[end_node] = {}
+                in_edges[end_node] = {}
+            edge_id = children.get(end_node)
+            if edge_id is not None:
+                negative_costs += (cost < 0) - (expense[edge_id] < 0)
+                expense[edge_id] = cost
+                changed.append((start_node, end_node, cost))
+                continue
+            if free_edge_ids:
+                edge_id = free_edge_ids.pop()
+            else:
+                edge_id = next_edge_id
+                next_edge_id += 1
+            children[end_node] = edge_id
+            parents[start_node] = edge_id
+            expense[edge_id] = cost
+            extremities[edge_id] = (start_node, end_node)
+            negative_costs += cost < 0
+            added.append((start_node, end_node, cost))
+
+        self.__index_edges_added(itertools.islice(in_edges, vertices_before, None), added, changed)
+        self.__negative_costs += negative_costs
+        self.__next_edge_id = next_edge_id
+        self.__edges_counter += len(added)
+        self.__mutated(vertices_changed=len(out_edges) != vertices_before)
+        return len(added)
+
+    def remove_edges_bulk(self, edges):
+        """
+        complexity: θ(e + d), where e - number of edges to remove, d - sum of the degrees of their extremities
+        Remove many edges at once, given as (start_node, end_node) pairs or (start_node, end_node, cost) triples
+        whose cost is ignored (see edge_rows for the NumPy arrays that are accepted). Edges that do not exist are
+        skipped, as by remover_of_edge_from_graph.
+
+        The rows are validated in one pass before the graph is changed; the counters and the version are then
+        updated once, and every row of the indexed adjacency lists that loses edges is filtered once.
+
+        :param edges: The edges to remove.
+        :type edges: iterable of (int or str, int or str) or (int or str, int or str, float), or NumPy arrays
+        :return: The number of removed edges.
+        :rtype: int
+        :raises ValueError: If a row is not a pair or a triple.
+        """
+        rows = self.__edge_batch(edges, (2, 3))
+        if self.__undo_log is not None:
+            edges_before = self.__edges_counter
+            for row in rows:
+                self.remover_of_edge_from_graph(row[0], row[1])
+            return edges_before - self.__edges_counter
+        in_edges = self.__in_edges
+        out_edges = self.__out_edges
+        expense = self.__edges_expense
+        extremities = self.__edges_extremities
+        removed = []
+        negative_costs = 0
+        for row in rows:
+            start_node, end_node = row[0], row[1]
+            children = in_edges.get(start_node)
+            if children is None or end_node not in children:
+                continue
+            edge_id = children.pop(end_node)
+            del out_edges[end_node][start_node]
+            negative_costs += expense.pop(edge_id) < 0
+            del extremities[edge_id]
+            self.__release_edge_id(edge_id)
+            removed.append((start_node, end_node))
+        if not removed:
+            return 0
+        self.__index_edges_removed(removed)
+        self.__negative_costs -= negative_costs
+        self.__edges_counter -= len(removed)
+        self.__mutated()
+        return len(removed)
 
     def remover_of_edge_from_graph(self, start_node, end_node):
         """
@@ -367,39 +1011,139 @@ class Graph:
         :type end_node: int or str
         """
         if self.checker_of_edge_existence(start_node, end_node):
-            del self.__edges_expense[self.__in_edges[start_node][end_node]]
+            edge_id = self.__in_edges[start_node][end_node]
+            self.__negative_costs -= self.__edges_expense[edge_id] < 0
+            self.__record(self.__edges_expense, edge_id)
+            self.__record(self.__edges_extremities, edge_id)
+            self.__record(self.__in_edges[start_node], end_node)
+            self.__record(self.__out_edges[end_node], start_node)
+            del self.__edges_expense[edge_id]
+            del self.__edges_extremities[edge_id]
             del self.__in_edges[start_node][end_node]
             del self.__out_edges[end_node][start_node]
+            self.__index_edge_changed(start_node, end_node)
             self.__edges_counter -= 1
+            self.__release_edge_id(edge_id)
+            self.__mutated()
 
-    def getter_of_copy_of_graph(self):
+    def clear(self, vertices_counter=0):
+        """
+        complexity: θ(1)
+        Remove every vertex and edge of the graph, and set its number of vertices. The snapshots are kept, so the
+        graph can still be restored to any of them.
+
+        :param vertices_counter: The new number of vertices of the graph. Default value is 0.
+        :type vertices_counter: int
+        """
+        if self.__undo_log is not None:
+            # The dictionaries are replaced, not emptied, so the undo log only has to keep the old ones
+            self.__undo_log.append((None, None, (self.__out_edges, self.__in_edges, self.__edges_expense,
+                                                 self.__edges_extremities)))
+        self.__out_edges = {}
+        self.__in_edges = {}
+        self.__edges_expense = {}
+        self.__edges_extremities = {}
+        self.__edges_counter = 0
+        self.__negative_costs = 0
+        self.__free_edge_ids = []
+        self.__vertices_counter = vertices_counter
+        self.__drop_indexes()
+        self.__mutated(vertices_changed=True)
+
+    def take_snapshot(self, name=DEFAULT_SNAPSHOT):
         """
-        Return a deep copy of the graph.
+        complexity: θ(1) (plus the number of recycled edge IDs waiting to be reused)
+        Take a named snapshot of the graph, replacing the snapshot of the same name if there is one.
+
+        Nothing is copied: from now on, every change made to the graph records the value it replaces in an undo
+        log, and restore_snapshot undoes the changes made since the snapshot.
 
-        :return: A deep copy of the graph.
-        :rtype: Graph
+        :param name: The name of the snapshot. Default value is DEFAULT_SNAPSHOT.
         """
-        g = Graph(self.__vertices_counter)
-        g.__out_edges = copy.deepcopy(self.__out_edges)
-        g.__in_edges = copy.deepcopy(self.__in_edges)
-        g.__edges_expense = copy.deepcopy(self.__edges_expense)
-        g.__edges_counter = self.__edges_counter
-        self.__copy = g
+        if self.__undo_log is None:
+            self.__undo_log = []
+        self.__snapshots[name] = (len(self.__undo_log), self.__vertices_counter, self.__edges_counter,
+                                  self.__negative_costs, list(self.__free_edge_ids))
 
-    def get_copy(self):
-        return self.__copy
+    def restore_snapshot(self, name=DEFAULT_SNAPSHOT):
+        """
+        complexity: θ(c), where c - number of changes made since the snapshot
+        Restore the graph to the named snapshot, by undoing the changes made since it was taken.
+        The snapshot is kept, while the snapshots taken after it are dropped. The edges keep their IDs, and the IDs
+        allocated since the snapshot are not reused.
+
+        :param name: The name of the snapshot. Default value is DEFAULT_SNAPSHOT.
+        :raises ValueError: If there is no snapshot with the given name.
+        """
+        if name not in self.__snapshots:
+            raise ValueError(f"There is no snapshot named {name!r}.")
+        position, vertices_counter, edges_counter, negative_costs, free_edge_ids = self.__snapshots[name]
+        undo_log = self.__undo_log
+        undo_log_changed = len(undo_log) > position
+        vertices_changed = False
+        for dictionary, key, value in reversed(undo_log[position:]):
+            if dictionary is None:
+                self.__out_edges, self.__in_edges, self.__edges_expense, self.__edges_extremities = value
+                vertices_changed = True
+                continue
+            if value is _MISSING:
+                del dictionary[key]
+            else:
+                dictionary[key] = value
+            vertices_changed = vertices_changed or dictionary is self.__out_edges or dictionary is self.__in_edges
+        del undo_log[position:]
+        self.__snapshots = {snapshot_name: snapshot for snapshot_name, snapshot in self.__snapshots.items()
+                            if snapshot[0] <= position}
+        self.__vertices_counter = vertices_counter
+        self.__edges_counter = edges_counter
+        self.__negative_costs = negative_costs
+        self.__free_edge_ids = list(free_edge_ids)
+        if undo_log_changed:
+            self.__drop_indexes()
+        self.__mutated(vertices_changed)
+
+    def drop_snapshot(self, name=DEFAULT_SNAPSHOT):
+        """
+        complexity: θ(1), or θ(c) when the last snapshot is dropped, where c - number of changes in the undo log
+        Drop the named snapshot; once no snapshot is left, the changes are not recorded anymore.
+
+        :param name: The name of the snapshot. Default value is DEFAULT_SNAPSHOT.
+        :raises ValueError: If there is no snapshot with the given name.
+        """
+        if name not in self.__snapshots:
+            raise ValueError(f"There is no snapshot named {name!r}.")
+        del self.__snapshots[name]
+        if not self.__snapshots:
+            self.__undo_log = None
+
+    def getter_snapshot_names(self):
+        """
+        complexity: θ(s), where s - number of snapshots
+        Get the names of the snapshots of the graph.
+
+        :rtype: list
+        """
+        return list(self.__snapshots)
+
+    def getter_of_copy_of_graph(self):
+        """
+        complexity: θ(1)
+        Save a copy of the graph, restored by set_copy_of_graph; this is the DEFAULT_SNAPSHOT snapshot.
+        """
+        self.take_snapshot(DEFAULT_SNAPSHOT)
 
     def set_copy_of_graph(self):
-        print(self.__copy)
-        if self.__copy == None:
+        """
+        complexity: θ(c), where c - number of changes made since the copy
+        Restore the graph to the copy saved by getter_of_copy_of_graph.
+
+        :return: 1 if no copy was saved, 0 otherwise.
+        :rtype: int
+        """
+        if DEFAULT_SNAPSHOT not in self.__snapshots:
             return 1
-        else:
-            self.__out_edges = self.__copy.__out_edges
-            self.__in_edges = self.__copy.__in_edges
-            self.__edges_expense = self.__copy.__edges_expense
-            self.__edges_counter = self.__copy.__edges_counter
-            self.__vertices_counter = self.__copy.__vertices_counter
-            return 0
+        self.restore_snapshot(DEFAULT_SNAPSHOT)
+        return 0
 
     def setter_of_cost_on_edge(self, edge_id, cost):
         """
@@ -410,4 +1154,9 @@ class Graph:
         :param cost: The cost of the edge.
         :type cost: float or int
         """
+        self.__cost_replaced(edge_id, cost)
+        self.__record(self.__edges_expense, edge_id)
         self.__edges_expense[edge_id] = cost
+        if edge_id in self.__edges_extremities:
+            self.__index_edge_changed(*self.__edges_extremities[edge_id], cost)
+        self.__mutated()
@@ -0,0 +1,137 @@
+import bz2
+import gzip
+import lzma
+import time
+from array import array
+from functools import partial
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+CHUNK_SIZE = 1 << 24
+WRITE_BATCH_SIZE = 1 << 16
+
+COMPRESSIONS = {
+    "gzip": (partial(gzip.open, compresslevel=6), ".gz"),
+    "bz2": (bz2.open, ".bz2"),
+    "lzma": (lzma.open, ".xz"),
+}
+if zstd is not None:
+    COMPRESSIONS["zstd"] = (zstd.open, ".zst")
+
+
+def open_graph_file(filename, mode, compression=None):
+    """
+    complexity: θ(1)
+    Open a graph file, transparently compressed with one of the stdlib codecs.
+
+    :param filename: The name of the file.
+    :type filename: str
+    :param mode: The mode in which to open the file ("rb", "wt", ...).
+    :type mode: str
+    :param compression: One of the keys of COMPRESSIONS, or None to choose the codec from the file extension
+                        (.gz, .bz2, .xz, .zst) and fall back to an uncompressed file.
+    :type compression: str
+    :return: The opened file object.
+    """
+    if compression is None:
+        for opener, extension in COMPRESSIONS.values():
+            if filename.endswith(extension):
+                return opener(filename, mode)
+        return open(filename, mode)
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown compression {compression!r}, expected one of {', '.join(COMPRESSIONS)}.")
+    return COMPRESSIONS[compression][0](filename, mode)
+
+
+def read_edge_arrays(filename, chunk_size=CHUNK_SIZE, progress_callback=None):
+    """
+    complexity: θ(e), where e - number of edges
+    Parse a graph file in the text format used by Controller.read_graph_from_file in large buffered chunks.
+
+    The first line holds the number of vertices and the number of edges e, followed by e lines "start end cost".
+    Instead of reading and splitting one line at a time, the file is read chunk_size bytes at a time and every
+    chunk is split into integers in a single pass; the partial line at the end of a chunk is carried over to
+    the next one.
+
+    :param filename: The name of the file from which to read the graph; compressed files are recognized by their
+                     extension (see open_graph_file).
+    :type filename: str
+    :param chunk_size: The number of bytes read at once.
+    :type chunk_size: int
+    :param progress_callback: Called as progress_callback(edges_read, e) after every chunk. Default value is None.
+    :type progress_callback: callable
+    :return: A tuple (v, starts, ends, costs), where starts, ends and costs are parallel integer arrays.
+    :rtype: tuple
+    """
+    with open_graph_file(filename, "rb") as file:
+        v, e = map(int, file.readline().split())
+        starts = array('q')
+        ends = array('q')
+        costs = array('q')
+        leftover = b""
+        while len(starts) < e:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                numbers = leftover.split()
+                leftover = b""
+            else:
+                chunk = leftover + chunk
+                cut = chunk.rfind(b"\n") + 1
+                numbers, leftover = chunk[:cut].split(), chunk[cut:]
+            numbers = numbers[:3 * (e - len(starts))]
+            if len(numbers) % 3 != 0:
+                raise ValueError(f"Malformed edge line in {filename}.")
+            numbers = list(map(int, numbers))
+            starts.extend(numbers[0::3])
+            ends.extend(numbers[1::3])
+            costs.extend(numbers[2::3])
+            if progress_callback is not None:
+                progress_callback(len(starts), e)
+            if not chunk:
+                break
+        if len(starts) < e:
+            raise ValueError(f"{filename} declares {e} edges but contains only {len(starts)}.")
+    return v, starts, ends, costs
+
+
+def write_graph(graph, filename, compression=None, batch_size=WRITE_BATCH_SIZE):
+    """
+    complexity: θ(v + e), where v - number of vertices, e - number of edges
+    Write a graph (Graph or CompactGraph) to a file in the text format.
+
+    The lines are formatted straight from the cost table and written in joined batches of batch_size lines,
+    instead of one write call per edge.
+
+    :param graph: The graph to write.
+    :param filename: The name of the file to which to write the graph.
+    :type filename: str
+    :param compression: The codec to compress the file with (see open_graph_file). Default value is None.
+    :type compression: str
+    :param batch_size: The number of lines joined into a single write call.
+    :type batch_size: int
+    :return: A tuple (bytes_written, seconds), where bytes_written is the size of the uncompressed text.
+    :rtype: tuple
+    """
+    start = time.perf_counter()
+    written = 0
+    with open_graph_file(filename, "wt", compression) as file:
+        header = f"{graph.getter_for_vertices_counter()} {graph.getter_number_of_edges()}\n"
+        file.write(header)
+        written += len(header)
+        costs = graph.get_costs()
+        out_edges = graph.get_child_edges()
+        batch = []
+        for x in out_edges:
+            batch.extend([f"{x} {y} {costs[edge_id]}\n" for y, edge_id in out_edges[x].items()])
+            if len(batch) >= batch_size:
+                text = "".join(batch)
+                file.write(text)
+                written += len(text)
+                batch = []
+        text = "".join(batch)
+        file.write(text)
+        written += len(text)
+    return written, time.perf_counter() - start
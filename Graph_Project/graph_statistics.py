@@ -0,0 +1,189 @@
+import heapq
+import itertools
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+IN = "in"
+OUT = "out"
+TOTAL = "total"
+
+
+def edge_arrays_from_rows(targets, costs):
+    """
+    complexity: θ(v + e), where v - number of rows, e - number of edges
+    Flatten adjacency lists over the dense indices of the vertices (see Graph.getter_indexed_adjacency) into three
+    parallel edge arrays.
+
+    :param targets: targets[i] holds the indices of the outbound neighbours of the vertex of index i.
+    :param costs: costs[i] holds the costs of the edges to them.
+    :return: A tuple (starts, ends, costs): int64 and int64 or float64 NumPy arrays, or array('q') and lists
+             without NumPy.
+    :rtype: tuple
+    """
+    lengths = [len(row) for row in targets]
+    if np is None:
+        starts = array('q')
+        for i, length in enumerate(lengths):
+            starts.extend(array('q', [i]) * length)
+        return starts, array('q', itertools.chain.from_iterable(targets)), list(itertools.chain.from_iterable(costs))
+    size = sum(lengths)
+    starts = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+    ends = np.fromiter(itertools.chain.from_iterable(targets), dtype=np.int64, count=size)
+    return starts, ends, np.array(list(itertools.chain.from_iterable(costs)))
+
+
+class GraphStatistics:
+    def __init__(self, labels, present, starts, ends, costs):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Compute the degrees and the cost sums of every vertex in one pass over the edge arrays of a graph
+        (see Graph.getter_statistics). With NumPy every quantity is a single bincount over the arrays; without it
+        the arrays are counted in a plain loop.
+
+        The arrays of the statistics are indexed by the dense indices of the vertices (see
+        Graph.getter_vertex_labels): NumPy arrays when NumPy is installed, lists otherwise.
+
+        :param labels: The vertex of every dense index.
+        :param present: present[i] is True if the dense index i is a vertex (the indices of a CompactGraph that are
+                        not vertices are left out of the histograms, the hubs and the summary).
+        :param starts: The dense index of the start vertex of every edge.
+        :param ends: The dense index of the end vertex of every edge.
+        :param costs: The cost of every edge.
+        """
+        size = len(labels)
+        self.labels = labels
+        self.edges = len(starts)
+        if np is None:
+            self.__present = [i for i in range(size) if present[i]]
+            self.in_degrees = [0] * size
+            self.out_degrees = [0] * size
+            self.in_cost_sums = [0] * size
+            self.out_cost_sums = [0] * size
+            for x, y, cost in zip(starts, ends, costs):
+                self.out_degrees[x] += 1
+                self.in_degrees[y] += 1
+                self.out_cost_sums[x] += cost
+                self.in_cost_sums[y] += cost
+            return
+        self.__present = np.flatnonzero(np.asarray(present, dtype=bool))
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        costs = np.asarray(costs)
+        self.in_degrees = np.bincount(ends, minlength=size)
+        self.out_degrees = np.bincount(starts, minlength=size)
+        self.in_cost_sums = np.bincount(ends, weights=costs, minlength=size)
+        self.out_cost_sums = np.bincount(starts, weights=costs, minlength=size)
+
+    def degrees(self, direction=OUT):
+        """
+        complexity: θ(1), θ(v) for TOTAL, where v - number of vertices
+        :param direction: IN, OUT or TOTAL (in-degree plus out-degree). Default value is OUT.
+        :type direction: str
+        :return: The degree of every dense index.
+        :raises ValueError: If direction is unknown.
+        """
+        if direction == IN:
+            return self.in_degrees
+        if direction == OUT:
+            return self.out_degrees
+        if direction == TOTAL:
+            if np is None:
+                return [a + b for a, b in zip(self.in_degrees, self.out_degrees)]
+            return self.in_degrees + self.out_degrees
+        raise ValueError(f"Unknown direction {direction!r}, expected in, out or total.")
+
+    def cost_sums(self, direction=OUT):
+        """
+        complexity: θ(1)
+        :param direction: IN for the costs of the inbound edges, OUT for the outbound ones. Default value is OUT.
+        :type direction: str
+        :return: The sum of the costs of the edges of every dense index (float64 with NumPy).
+        :raises ValueError: If direction is unknown.
+        """
+        if direction == IN:
+            return self.in_cost_sums
+        if direction == OUT:
+            return self.out_cost_sums
+        raise ValueError(f"Unknown direction {direction!r}, expected in or out.")
+
+    def degree_histogram(self, direction=OUT):
+        """
+        complexity: θ(v), where v - number of vertices
+        :param direction: IN, OUT or TOTAL. Default value is OUT.
+        :type direction: str
+        :return: counts, where counts[d] is the number of vertices of degree d.
+        """
+        degrees = self.degrees(direction)
+        if np is None:
+            counts = [0] * (max((degrees[i] for i in self.__present), default=-1) + 1)
+            for i in self.__present:
+                counts[degrees[i]] += 1
+            return counts
+        return np.bincount(degrees[self.__present])
+
+    def top_hubs(self, k=10, direction=TOTAL):
+        """
+        complexity: θ(v + k*log(k)) with NumPy, θ(v*log(k)) otherwise, where v - number of vertices
+        Find the k vertices of highest degree.
+
+        :param k: The number of vertices. Default value is 10.
+        :type k: int
+        :param direction: IN, OUT or TOTAL. Default value is TOTAL.
+        :type direction: str
+        :return: The list of (vertex, degree) pairs of the k vertices of highest degree, highest first.
+        :rtype: list
+        """
+        degrees = self.degrees(direction)
+        k = min(k, len(self.__present))
+        if k <= 0:
+            return []
+        if np is None:
+            hubs = heapq.nlargest(k, self.__present, key=degrees.__getitem__)
+        else:
+            candidates = degrees[self.__present]
+            best = np.argpartition(-candidates, k - 1)[:k]
+            hubs = self.__present[best[np.argsort(-candidates[best], kind="stable")]].tolist()
+        return [(self.labels[i], int(degrees[i])) for i in hubs]
+
+    def summary(self):
+        """
+        complexity: θ(v), where v - number of vertices
+        :return: A dictionary with the number of vertices and edges, the number of isolated vertices (no edge at
+                 all), the sources (no inbound edge) and the sinks (no outbound edge), the largest in-degree and
+                 out-degree, the average out-degree and the total cost of the edges.
+        :rtype: dict
+        """
+        vertices = len(self.__present)
+        if np is None:
+            in_degrees = [self.in_degrees[i] for i in self.__present]
+            out_degrees = [self.out_degrees[i] for i in self.__present]
+            isolated = sum(1 for a, b in zip(in_degrees, out_degrees) if a == 0 and b == 0)
+            sources = in_degrees.count(0)
+            sinks = out_degrees.count(0)
+            max_in_degree = max(in_degrees, default=0)
+            max_out_degree = max(out_degrees, default=0)
+            total_cost = sum(self.out_cost_sums)
+        else:
+            in_degrees = self.in_degrees[self.__present]
+            out_degrees = self.out_degrees[self.__present]
+            isolated = int(np.count_nonzero((in_degrees == 0) & (out_degrees == 0)))
+            sources = int(np.count_nonzero(in_degrees == 0))
+            sinks = int(np.count_nonzero(out_degrees == 0))
+            max_in_degree = int(in_degrees.max()) if vertices else 0
+            max_out_degree = int(out_degrees.max()) if vertices else 0
+            total_cost = self.out_cost_sums.sum().item()
+        return {
+            "vertices": vertices,
+            "edges": self.edges,
+            "isolated": isolated,
+            "sources": sources,
+            "sinks": sinks,
+            "max_in_degree": max_in_degree,
+            "max_out_degree": max_out_degree,
+            "average_out_degree": self.edges / vertices if vertices else 0.0,
+            "total_cost": total_cost,
+        }
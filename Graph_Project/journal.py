@@ -0,0 +1,268 @@
+import os
+import struct
+
+from graph_io import write_graph
+
+# Journal format: a little-endian header (magic, format version, generation of the base graph file the journal
+# applies to, then size and modification time in nanoseconds of the base file and of the graph file the user opened)
+# followed by fixed size records (operation, a, b, cost). The records hold vertices and costs as int64.
+# The base file of generation 0 is the graph file itself; every compaction writes the next generation next to it.
+# Version 1 headers (magic, format version, size and modification time of the graph file) are still replayed.
+JOURNAL_MAGIC = b"GRAPHLOG"
+JOURNAL_VERSION = 2
+JOURNAL_HEADER = struct.Struct("<8sIIqqqq")
+JOURNAL_V1_HEADER = struct.Struct("<8sIqq")
+JOURNAL_RECORD = struct.Struct("<Bqqq")
+JOURNAL_EXTENSION = ".journal"
+# Number of records written and synced to the disk at once; a crash loses at most the records of one batch
+JOURNAL_BATCH_SIZE = 64
+
+# Operations of the records and the meaning of (a, b, cost)
+SET_VERTICES_COUNTER = 1  # (vertices_counter, -, -)
+ADD_VERTEX = 2  # (vertex, -, -)
+REMOVE_VERTEX = 3  # (vertex, -, -)
+SET_EDGE = 4  # (start_node, end_node, cost): add the edge, or set its cost if it exists
+REMOVE_EDGE = 5  # (start_node, end_node, -)
+
+
+def pack_record(operation, a=0, b=0, cost=0):
+    """
+    complexity: θ(1)
+    Encode one record of a journal. The changes are encoded before they are made to the graph, so a change the
+    journal cannot hold is refused while the graph is still unchanged.
+
+    :param operation: One of the operations of the module (SET_EDGE, REMOVE_EDGE, ...).
+    :type operation: int
+    :return: The record, ready to be appended (see MutationJournal.append).
+    :rtype: bytes
+    :raises ValueError: If a vertex or the cost is not a 64-bit integer.
+    """
+    try:
+        return JOURNAL_RECORD.pack(operation, a, b, cost)
+    except struct.error:
+        raise ValueError(f"The journal only holds 64-bit integer vertices and costs, got {a!r}, {b!r} and {cost!r}.")\
+            from None
+
+
+def apply_record(graph, operation, a, b, cost):
+    """
+    complexity: θ(1) amortized, θ(d) for REMOVE_VERTEX, where d - degree of the vertex
+    Apply one record of a journal to a graph.
+
+    :raises ValueError: If the operation is unknown.
+    """
+    if operation == SET_VERTICES_COUNTER:
+        graph.setter_for_vertices_counter(a)
+    elif operation == ADD_VERTEX:
+        graph.adder_of_vertex_into_graph(a)
+    elif operation == REMOVE_VERTEX:
+        graph.remover_of_vertex_from_graph(a)
+    elif operation == SET_EDGE:
+        graph.adder_of_edge_to_graph(a, b, cost)
+    elif operation == REMOVE_EDGE:
+        graph.remover_of_edge_from_graph(a, b)
+    else:
+        raise ValueError(f"Unknown journal operation {operation}.")
+
+
+class MutationJournal:
+    def __init__(self, filename, batch_size=JOURNAL_BATCH_SIZE):
+        """
+        complexity: θ(1)
+        Initialize the append-only journal of the changes made to the graph saved in filename.
+        The journal is the file filename + JOURNAL_EXTENSION; the graph is its base file with the records of the
+        journal applied in order, so saving a change only appends a record instead of rewriting the graph.
+
+        The base file starts as filename itself. compact writes the graph to a new base file, "v<generation>-" +
+        the name of filename, in the same directory, and starts a new journal pointing to it: the file the user
+        opened is never overwritten. The header of the journal identifies both files by their size and
+        modification time, and a journal that no longer matches them (for example when the user replaced the
+        graph file) is ignored.
+
+        :param filename: The name of the graph file the user opened.
+        :type filename: str
+        :param batch_size: The number of records buffered before they are written and synced to the disk.
+                           Default value is JOURNAL_BATCH_SIZE.
+        :type batch_size: int
+        """
+        self.graph_filename = filename
+        self.filename = filename + JOURNAL_EXTENSION
+        self.batch_size = batch_size
+        self.records = 0
+        self.__pending = bytearray()
+        self.__pending_records = 0
+        self.__file = None
+        # The generation of a journal that no longer matches its files, whose base file is deleted by replay
+        self.__stale_generation = 0
+        self.generation, self.__records_offset = self.__read_header()
+
+    def base_filename(self, generation=None):
+        """
+        complexity: θ(1)
+        :param generation: The generation of the base file, or None for the current one. Default value is None.
+        :type generation: int
+        :return: The name of the base file of the graph: the graph file itself for generation 0.
+        :rtype: str
+        """
+        generation = self.generation if generation is None else generation
+        if generation == 0:
+            return self.graph_filename
+        directory, name = os.path.split(self.graph_filename)
+        return os.path.join(directory, f"v{generation}-{name}")
+
+    def __header(self, generation):
+        """
+        complexity: θ(1)
+        :return: The journal header matching the current state of the base file of generation and of the graph file.
+        :rtype: bytes
+        """
+        base = os.stat(self.base_filename(generation))
+        graph = os.stat(self.graph_filename)
+        return JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, generation, base.st_size, base.st_mtime_ns,
+                                   graph.st_size, graph.st_mtime_ns)
+
+    def __read_header(self):
+        """
+        complexity: θ(1)
+        Read the header of the journal and check it against the files it identifies.
+
+        :return: A tuple (generation, offset of the first record), or (0, 0) if there is no journal or if it does not
+                 match its files.
+        :rtype: tuple
+        """
+        try:
+            with open(self.filename, "rb") as file:
+                data = file.read(JOURNAL_HEADER.size)
+        except FileNotFoundError:
+            return 0, 0
+        if len(data) >= JOURNAL_V1_HEADER.size and JOURNAL_V1_HEADER.unpack_from(data)[1] == 1:
+            graph = os.stat(self.graph_filename)
+            expected = JOURNAL_V1_HEADER.pack(JOURNAL_MAGIC, 1, graph.st_size, graph.st_mtime_ns)
+            return (0, JOURNAL_V1_HEADER.size) if data[:JOURNAL_V1_HEADER.size] == expected else (0, 0)
+        if len(data) < JOURNAL_HEADER.size:
+            return 0, 0
+        magic, version, generation = JOURNAL_HEADER.unpack(data)[:3]
+        if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+            return 0, 0
+        try:
+            if data == self.__header(generation):
+                return generation, JOURNAL_HEADER.size
+        except FileNotFoundError:
+            pass
+        self.__stale_generation = generation
+        return 0, 0
+
+    def replay(self, graph):
+        """
+        complexity: θ(r), where r - number of records
+        Apply the records of the journal to graph, which must have just been read from base_filename(), and open the
+        journal to append the next records.
+
+        A journal that does not match its files is discarded, with its base file, and so is a partial record at
+        its end, left by a crash in the middle of a write.
+
+        :param graph: The graph read from the base file.
+        :type graph: Graph
+        :return: The number of records applied.
+        :rtype: int
+        """
+        applied = 0
+        if self.__records_offset:
+            with open(self.filename, "rb") as file:
+                data = file.read()
+            offset = self.__records_offset
+            valid_size = offset + (len(data) - offset) // JOURNAL_RECORD.size * JOURNAL_RECORD.size
+            for operation, a, b, cost in JOURNAL_RECORD.iter_unpack(data[offset:valid_size]):
+                apply_record(graph, operation, a, b, cost)
+                applied += 1
+            self.__file = open(self.filename, "r+b")
+            self.__file.truncate(valid_size)
+            self.__file.seek(valid_size)
+        else:
+            if self.__stale_generation:
+                try:
+                    os.remove(self.base_filename(self.__stale_generation))
+                except FileNotFoundError:
+                    pass
+            self.__file = open(self.filename, "wb")
+            self.__file.write(self.__header(0))
+            self.__file.flush()
+            os.fsync(self.__file.fileno())
+        self.records = applied
+        return applied
+
+    def append(self, record):
+        """
+        complexity: θ(1) amortized
+        Append a record to the journal; the records are written and synced to the disk by batches of batch_size.
+
+        :param record: A record encoded by pack_record.
+        :type record: bytes
+        """
+        self.__pending += record
+        self.__pending_records += 1
+        self.records += 1
+        if self.__pending_records >= self.batch_size:
+            self.sync()
+
+    def sync(self):
+        """
+        complexity: θ(b), where b - number of buffered records
+        Write the buffered records to the journal and sync it to the disk.
+        """
+        if self.__pending:
+            self.__file.write(self.__pending)
+            self.__pending = bytearray()
+            self.__pending_records = 0
+        self.__file.flush()
+        os.fsync(self.__file.fileno())
+
+    def compact(self, graph):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Write graph to the base file of the next generation and start a new journal pointing to it, so the journal
+        does not grow forever. The graph file the user opened is left untouched.
+
+        The new base file is written first and the new journal is then renamed over the old one, which switches
+        to the new base file at once: if the program stops in between, the old journal and its base file are still
+        used. The base file of the previous generation is deleted last (unless it is the graph file itself).
+
+        :param graph: The graph, with every record of the journal applied.
+        :type graph: Graph
+        """
+        self.sync()
+        self.__file.close()
+        generation = self.generation + 1
+        # The base file keeps the name, and so the extension, of the graph file: write_graph compresses it alike
+        write_graph(graph, self.base_filename(generation))
+        with open(self.base_filename(generation), "rb") as file:
+            os.fsync(file.fileno())
+        # The text format only holds edges, so the vertices without edges start the new journal
+        out_edges = graph.get_child_edges()
+        in_edges = graph.get_parent_edges()
+        isolated = [v for v in out_edges if not out_edges[v] and not in_edges[v]]
+        journal_temporary = self.filename + ".tmp"
+        with open(journal_temporary, "wb") as file:
+            file.write(self.__header(generation))
+            file.write(b"".join(pack_record(ADD_VERTEX, v) for v in isolated))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(journal_temporary, self.filename)
+        previous, self.generation = self.generation, generation
+        if previous:
+            try:
+                os.remove(self.base_filename(previous))
+            except FileNotFoundError:
+                pass
+        self.__file = open(self.filename, "ab")
+        self.records = len(isolated)
+
+    def close(self):
+        """
+        complexity: θ(b), where b - number of buffered records
+        Write the buffered records and close the journal.
+        """
+        if self.__file is not None:
+            self.sync()
+            self.__file.close()
+            self.__file = None
@@ -0,0 +1,91 @@
+import functools
+import inspect
+from collections import OrderedDict
+
+
+class QueryCache:
+    def __init__(self, max_size=128):
+        """
+        complexity: θ(1)
+        Initialize a least recently used (LRU) cache of query results.
+
+        :param max_size: The maximum number of results kept; when it is reached, storing a new result evicts the
+                         least recently used one. 0 disables the cache. Default value is 128.
+        :type max_size: int
+        """
+        self.__entries = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        """
+        complexity: θ(1)
+        Look up the result stored for key, and count the hit or the miss.
+
+        :param key: A hashable key.
+        :return: A tuple (found, result), where result is None when found is False.
+        :rtype: tuple
+        """
+        if key in self.__entries:
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return True, self.__entries[key]
+        self.misses += 1
+        return False, None
+
+    def store(self, key, result):
+        """
+        complexity: θ(1)
+        Store the result for key, evicting the least recently used results above max_size.
+
+        :param key: A hashable key.
+        :param result: The result to store.
+        """
+        if self.max_size <= 0:
+            return
+        self.__entries[key] = result
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        complexity: θ(n), where n - number of results stored
+        Remove every result and reset the counters.
+        """
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+def cached_query(method):
+    """
+    Decorate a query method of the Controller so that its results are kept in self.cache, keyed by the name of
+    the method, its arguments and the version of self.graph: any mutation of the graph gives it a new version,
+    so the results computed before are never returned again (they age out of the cache).
+
+    The budget argument is not part of the key, and a result cut short by its budget is not stored. Exceptions
+    are not cached. The cached results are shared between the callers, who must not modify them.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        arguments = signature.bind(self, *args, **kwargs)
+        arguments.apply_defaults()
+        budget = arguments.arguments.pop("budget", None)
+        del arguments.arguments["self"]
+        key = (method.__name__, tuple(arguments.arguments.values()), self.graph.getter_version())
+        found, result = self.cache.lookup(key)
+        if found:
+            return result
+        result = method(self, *args, **kwargs)
+        if budget is None or not budget.exhausted():
+            self.cache.store(key, result)
+        return result
+
+    return wrapper
@@ -0,0 +1,131 @@
+import math
+import os
+import random
+import time
+from array import array
+
+from compact_graph import write_binary_edges
+from graph_io import open_graph_file, WRITE_BATCH_SIZE
+from graph_statistics import np
+
+MIN_COST = 1
+MAX_COST = 100
+
+
+def _sample_pairs(rng, pairs, count):
+    """
+    complexity: θ(e*log(e)) expected, where e - number of sampled pairs
+    Draw count distinct integers from range(pairs), uniformly, with NumPy. While at most half of the range is drawn,
+    integers are drawn with replacement, as many as needed to find the missing ones in a single round in expectation,
+    and the extra ones are dropped at random; a denser sample is found as the complement of the integers it leaves
+    out.
+
+    :param rng: A NumPy Generator.
+    :return: The sorted sample, as an int64 NumPy array.
+    """
+    if count > pairs // 2:
+        kept = np.ones(pairs, dtype=bool)
+        kept[_sample_pairs(rng, pairs, pairs - count)] = False
+        return np.flatnonzero(kept)
+    sample = np.empty(0, dtype=np.int64)
+    while len(sample) < count:
+        # k draws hit about free * (1 - exp(-k / pairs)) of the free integers
+        free = pairs - len(sample)
+        draws = int(-pairs * math.log1p(-(count - len(sample)) / free) * 1.05) + 16
+        sample = np.union1d(sample, rng.integers(0, pairs, size=draws, dtype=np.int64))
+    if len(sample) > count:
+        sample = np.sort(rng.choice(sample, count, replace=False))
+    return sample
+
+
+def random_edge_arrays(nr_of_vertices, nr_of_edges, seed=None, min_cost=MIN_COST, max_cost=MAX_COST):
+    """
+    complexity: θ(e*log(e)), where e - number of edges
+    Draw nr_of_edges distinct edges between the vertices 0..nr_of_vertices - 1, uniformly among all the sets of
+    that many edges (self loops included), with a random integer cost in [min_cost, max_cost] each.
+
+    Instead of drawing random endpoints and retrying while the edge already exists, which slows down as the graph
+    gets dense, the edges are sampled as distinct indices start * nr_of_vertices + end of the nr_of_vertices ** 2
+    possible ones, without replacement. The same seed always gives the same edges, but NumPy (when installed) and
+    the standard random module give different edges for it.
+
+    :param nr_of_vertices: The number of vertices.
+    :type nr_of_vertices: int
+    :param nr_of_edges: The number of edges.
+    :type nr_of_edges: int
+    :param seed: The seed of the random generator, or None for a random one. Default value is None.
+    :type seed: int
+    :param min_cost: The lowest cost of an edge. Default value is MIN_COST.
+    :type min_cost: int
+    :param max_cost: The highest cost of an edge. Default value is MAX_COST.
+    :type max_cost: int
+    :return: A tuple (starts, ends, costs) of parallel integer arrays (NumPy arrays when NumPy is installed), sorted
+             by start and then by end.
+    :rtype: tuple
+    :raises ValueError: If a number is negative, or if there are more edges than the nr_of_vertices ** 2 possible.
+    """
+    if nr_of_vertices < 0 or nr_of_edges < 0:
+        raise ValueError("The number of vertices and the number of edges must not be negative.")
+    pairs = nr_of_vertices * nr_of_vertices
+    if nr_of_edges > pairs:
+        raise ValueError(f"A graph with {nr_of_vertices} vertices has at most {pairs} edges, "
+                         f"{nr_of_edges} were requested.")
+    if np is not None:
+        rng = np.random.default_rng(seed)
+        sample = _sample_pairs(rng, pairs, nr_of_edges)
+        costs = rng.integers(min_cost, max_cost + 1, size=nr_of_edges, dtype=np.int64)
+        return sample // nr_of_vertices, sample % nr_of_vertices, costs
+    rng = random.Random(seed)
+    # random.sample draws from a range without building it, and switches to a list of the range when it is dense
+    sample = sorted(rng.sample(range(pairs), nr_of_edges))
+    starts = array('q', [i // nr_of_vertices for i in sample])
+    ends = array('q', [i % nr_of_vertices for i in sample])
+    return starts, ends, array('q', rng.choices(range(min_cost, max_cost + 1), k=nr_of_edges))
+
+
+def write_random_graph(filename, nr_of_vertices, nr_of_edges, seed=None, binary=False, compression=None,
+                       batch_size=WRITE_BATCH_SIZE):
+    """
+    complexity: θ(e*log(e)), where e - number of edges
+    Write a random graph (see random_edge_arrays) straight to a file, without building a Graph: only the edge arrays
+    are kept in memory.
+
+    :param filename: The name of the file.
+    :type filename: str
+    :param nr_of_vertices: The number of vertices.
+    :type nr_of_vertices: int
+    :param nr_of_edges: The number of edges.
+    :type nr_of_edges: int
+    :param seed: The seed of the random generator, or None for a random one. Default value is None.
+    :type seed: int
+    :param binary: If True, write the binary format read by CompactGraph.from_binary_file (without the CSR
+                   sections), otherwise the text format. Default value is False.
+    :type binary: bool
+    :param compression: The codec to compress a text file with (see open_graph_file). Default value is None.
+    :type compression: str
+    :param batch_size: The number of text lines joined into a single write call.
+    :type batch_size: int
+    :return: A tuple (bytes_written, seconds), where bytes_written is the size of the uncompressed file.
+    :rtype: tuple
+    :raises ValueError: As random_edge_arrays, or if a binary file is to be compressed.
+    """
+    if binary and compression is not None:
+        raise ValueError("Binary graph files cannot be compressed.")
+    start = time.perf_counter()
+    starts, ends, costs = random_edge_arrays(nr_of_vertices, nr_of_edges, seed)
+    if binary:
+        write_binary_edges(filename, nr_of_vertices, starts, ends, costs)
+        return os.path.getsize(filename), time.perf_counter() - start
+    written = 0
+    with open_graph_file(filename, "wt", compression) as file:
+        header = f"{nr_of_vertices} {nr_of_edges}\n"
+        file.write(header)
+        written += len(header)
+        for first in range(0, nr_of_edges, batch_size):
+            last = first + batch_size
+            text = "".join([f"{x} {y} {cost}\n" for x, y, cost in zip(starts[first:last].tolist(),
+                                                                          ends[first:last].tolist(),
+                                                                          costs[first:last].tolist())])
+            file.write(text)
+            written += len(text)
+    return written, time.perf_counter() - start
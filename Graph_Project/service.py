@@ -1,19 +1,83 @@
 from graph import Graph
-from random import randint
+from compact_graph import CompactGraph
+from disjoint_set import DisjointSet
+from graph_io import read_edge_arrays, write_graph, CHUNK_SIZE
+from query_cache import QueryCache, cached_query
+from shortest_path_tree import ShortestPathTree
+from journal import MutationJournal, pack_record, SET_VERTICES_COUNTER, ADD_VERTEX, REMOVE_VERTEX, SET_EDGE, REMOVE_EDGE
+from distance_matrix import new_distance_matrix, floyd_warshall, np, FLOYD_WARSHALL_MAX_VERTICES
+from random_graph import random_edge_arrays, write_random_graph
 from queue import PriorityQueue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import heapq
+import os
 import sys
+import tempfile
+import time
 
 INF = sys.maxsize
 
 
+class NegativeCycleError(Exception):
+    def __init__(self, cycle):
+        """
+        Raised when a negative cost cycle is reachable from the start vertex of a shortest path query.
+
+        :param cycle: The vertices of the offending cycle, in order, with the first vertex repeated at the end.
+        :type cycle: list
+        """
+        super().__init__(f"The graph contains a negative cost cycle: {' -> '.join(map(str, cycle))}!")
+        self.cycle = cycle
+
+    def __reduce__(self):
+        # Rebuilt from the cycle, so that the error keeps its cycle when sent back by a worker process
+        return NegativeCycleError, (self.cycle,)
+
+
+# The Controller of a worker process of Controller.batch_lowest_cost_walks
+_batch_controller = None
+
+
+def _init_batch_worker(binary_filename):
+    """
+    Initialize a worker process of Controller.batch_lowest_cost_walks: the graph is memory-mapped from the binary
+    file written by the parent, so the pages are shared between the workers instead of being pickled to each task.
+    """
+    global _batch_controller
+    _batch_controller = Controller()
+    _batch_controller.read_binary_graph_from_file(binary_filename)
+
+
+def _answer_batch_source(source, targets):
+    """
+    Answer, in a worker process, the queries of Controller.batch_lowest_cost_walks that start from source.
+
+    :return: The list of (source, target, cost, path) results.
+    :rtype: list
+    """
+    walks = _batch_controller.lowest_cost_walks(source, targets)
+    return [(source, target, cost, path) for target, (cost, path) in zip(targets, walks)]
+
+
 class Controller:
-    def __init__(self):
+    # Number of records below which the mutation journal is never compacted
+    COMPACTION_MIN_RECORDS = 1024
+
+    def __init__(self, cache_size=128):
         """
         Constructor for the Controller class.
 
         Initializes a graph object that will be used for algorithms.
+
+        :param cache_size: The number of query results kept in self.cache (see query_cache.cached_query).
+                           Default value is 128.
+        :type cache_size: int
         """
         self.graph = Graph()
+        self.cache = QueryCache(cache_size)
+        self.__trees = {}
+        self.journal = None
         self.visited = [False] * self.graph.getter_number_of_vertices()
         self.cycle = []
         self.copy = None
@@ -31,6 +95,8 @@ class Controller:
         """
         with open(filename, "r") as file:
             v, e = map(int, file.readline().split())
+            self.close_journal()
+            self.__close_graph()
             self.graph = Graph(v)
             for i in range(e):
                 edge_id = i
@@ -38,73 +104,380 @@ class Controller:
                 start_node, end_node, cost = map(int, file.readline().split())
                 self.graph.adder_of_edge_to_graph(start_node, end_node, cost)
 
-    def write_graph_to_file(self, filename):
+    def bulk_read_graph_from_file(self, filename, progress_callback=None, chunk_size=CHUNK_SIZE):
+        """
+        Read the graph from a file like read_graph_from_file, but parse the file in large buffered chunks
+        and insert all the edges through a single Graph.add_edges_bulk call.
+
+        :param filename: The name of the file from which to read the graph.
+        :type filename: str
+        :param progress_callback: Called as progress_callback(edges_read, total_edges) while parsing. Default value is None.
+        :type progress_callback: callable
+        :param chunk_size: The number of bytes read from the file at once.
+        :type chunk_size: int
+        """
+        v, starts, ends, costs = read_edge_arrays(filename, chunk_size, progress_callback)
+        self.close_journal()
+        self.__close_graph()
+        self.graph = Graph(v)
+        self.graph.add_edges_bulk(zip(starts, ends, costs))
+
+    def open_journal(self, filename, progress_callback=None):
+        """
+        Read the graph saved in filename with its mutation journal: the graph is read (see
+        bulk_read_graph_from_file) from the base file the journal points to, which is a newer file than filename
+        once the journal was compacted, and the journal is replayed on it. The next changes made through the
+        mutation methods of the Controller (add_vertex, add_edge, ...) are recorded in the journal.
+
+        :param filename: The name of the graph file.
+        :type filename: str
+        :param progress_callback: Called as progress_callback(edges_read, total_edges) while parsing. Default value is None.
+        :type progress_callback: callable
+        :return: The number of changes replayed from the journal.
+        :rtype: int
+        """
+        self.close_journal()
+        journal = MutationJournal(filename)
+        self.bulk_read_graph_from_file(journal.base_filename(), progress_callback)
+        replayed = journal.replay(self.graph)
+        self.journal = journal
+        return replayed
+
+    def close_journal(self):
+        """
+        Write the last changes to the mutation journal, if one is open, and stop recording the changes.
+        """
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def compact_journal(self):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Write the current graph to a new base file of the mutation journal and empty the journal (see
+        MutationJournal.compact). Also needed after changes the journal cannot record, such as restoring a snapshot.
+        """
+        if self.journal is not None:
+            self.journal.compact(self.graph)
+
+    def __journal_record(self, operation, a=0, b=0, cost=0):
+        """
+        Encode a change for the mutation journal, if one is open, before it is made to the graph, so a change the
+        journal cannot hold (a string vertex or a float cost) is refused with the graph unchanged.
+
+        :return: The encoded record, or None if no journal is open.
+        :rtype: bytes
+        :raises ValueError: If the journal cannot hold the change.
+        """
+        return None if self.journal is None else pack_record(operation, a, b, cost)
+
+    def __journaled(self, record):
+        """
+        Record a change encoded by __journal_record in the mutation journal, if one is open. Once the journal holds
+        more records than the graph has edges (and at least COMPACTION_MIN_RECORDS), it is compacted, so replaying
+        it never costs more than reading the graph file, and compactions cost O(1) amortized per change.
+        """
+        if record is None or self.journal is None:
+            return
+        self.journal.append(record)
+        if self.journal.records >= max(self.COMPACTION_MIN_RECORDS, self.graph.getter_number_of_edges()):
+            self.journal.compact(self.graph)
+
+    def set_vertices_counter(self, vertices_counter):
+        """
+        Set the number of vertices of the graph, and record the change in the mutation journal.
+        """
+        record = self.__journal_record(SET_VERTICES_COUNTER, vertices_counter)
+        self.graph.setter_for_vertices_counter(vertices_counter)
+        self.__journaled(record)
+
+    def add_vertex(self, vertex):
+        """
+        Add a vertex to the graph, and record the change in the mutation journal.
+        """
+        record = self.__journal_record(ADD_VERTEX, vertex)
+        self.graph.adder_of_vertex_into_graph(vertex)
+        self.__journaled(record)
+
+    def remove_vertex(self, vertex):
+        """
+        Remove a vertex and its edges from the graph, and record the change in the mutation journal.
+        """
+        record = self.__journal_record(REMOVE_VERTEX, vertex)
+        self.graph.remover_of_vertex_from_graph(vertex)
+        self.__journaled(record)
+
+    def add_edge(self, start_node, end_node, cost):
+        """
+        Add an edge to the graph (or set its cost if it exists), and record the change in the mutation journal.
+
+        :return: The ID of the edge.
+        :rtype: int
+        """
+        record = self.__journal_record(SET_EDGE, start_node, end_node, cost)
+        edge_id = self.graph.adder_of_edge_to_graph(start_node, end_node, cost)
+        self.__journaled(record)
+        return edge_id
+
+    def remove_edge(self, start_node, end_node):
+        """
+        Remove an edge from the graph, and record the change in the mutation journal.
+        """
+        record = self.__journal_record(REMOVE_EDGE, start_node, end_node)
+        self.graph.remover_of_edge_from_graph(start_node, end_node)
+        self.__journaled(record)
+
+    def set_cost_of_edge(self, edge_id, cost):
+        """
+        Set the cost of an edge, and record the change in the mutation journal (by the extremities of the edge,
+        since the edge IDs are not stored in the graph file).
+
+        :raises ValueError: If there is no edge with the given ID.
         """
-        Write the graph to a file.
+        start_node, end_node = self.graph.getter_of_the_extremities_of_edge(edge_id)
+        if (start_node, end_node) == (-1, -1):
+            raise ValueError(f"There is no edge with the ID {edge_id}.")
+        record = self.__journal_record(SET_EDGE, start_node, end_node, cost)
+        self.graph.setter_the_cost_of_edge(edge_id, cost)
+        self.__journaled(record)
+
+    def read_compact_graph_from_file(self, filename):
+        """
+        Read the graph from a file straight into a frozen, array-backed CompactGraph.
+        The algorithms of the controller run on it unchanged, but the graph can no longer be modified.
+
+        :param filename: The name of the file from which to read the graph.
+        :type filename: str
+        """
+        graph = CompactGraph.from_file(filename)
+        self.close_journal()
+        self.__close_graph()
+        self.graph = graph
+
+    def compact_graph(self):
+        """
+        Replace the current graph with a frozen, array-backed CompactGraph holding the same vertices and edges.
+        The edge ids are renumbered to their position in the compact arrays.
+        """
+        graph = CompactGraph.from_graph(self.graph)
+        self.close_journal()
+        self.__close_graph()
+        self.graph = graph
+
+    def write_graph_to_file(self, filename, compression=None):
+        """
+        Write the graph to a file, in large batches.
 
         :param filename: The name of the file to which to write the graph.
         :type filename: str
+        :param compression: "gzip", "bz2", "lzma" or "zstd" (when available) to compress the file, None to
+                            choose from the file extension. Default value is None.
+        :type compression: str
+        :return: A tuple (bytes_written, seconds) describing the uncompressed text written.
+        :rtype: tuple
+        """
+        return write_graph(self.graph, filename, compression)
+
+    def read_binary_graph_from_file(self, filename):
         """
-        with open(filename, "w") as file:
-            file.write(f"{self.graph.getter_for_vertices_counter()} {self.graph.getter_number_of_edges()}\n")
-            out_edges = self.graph.get_child_edges()
-            for x in out_edges:
-                for y in out_edges[x]:
-                    file.write(f"{x} {y} {self.graph.getter_the_cost_of_edge(out_edges[x][y])}\n")
+        Open a binary graph file by memory-mapping it into a frozen CompactGraph, without parsing it.
 
-    def generate_random_graph(self, nr_of_vertices, nr_of_edges):
+        :param filename: The name of the binary graph file.
+        :type filename: str
         """
-        Generate a random graph.
+        graph = CompactGraph.from_binary_file(filename)
+        self.close_journal()
+        self.__close_graph()
+        self.graph = graph
+
+    def __close_graph(self):
+        """
+        Close the memory-mapped file of the current graph, if it has one (see CompactGraph.close), before the
+        graph is replaced.
+        """
+        if isinstance(self.graph, CompactGraph):
+            self.graph.close()
+
+    def write_binary_graph_to_file(self, filename, with_csr=True):
+        """
+        Write the graph to a file in the binary format.
+
+        :param filename: The name of the binary graph file.
+        :type filename: str
+        :param with_csr: If True, the prebuilt CSR offsets are written too. Default value is True.
+        :type with_csr: bool
+        """
+        graph = self.graph if isinstance(self.graph, CompactGraph) else CompactGraph.from_graph(self.graph)
+        graph.to_binary_file(filename, with_csr)
+
+    @staticmethod
+    def convert_text_to_binary(text_filename, binary_filename, with_csr=True):
+        """
+        Convert a graph file from the text format to the binary format.
+
+        :param text_filename: The name of the text graph file.
+        :type text_filename: str
+        :param binary_filename: The name of the binary graph file to write.
+        :type binary_filename: str
+        :param with_csr: If True, the prebuilt CSR offsets are written too. Default value is True.
+        :type with_csr: bool
+        """
+        CompactGraph.from_file(text_filename).to_binary_file(binary_filename, with_csr)
+
+    @staticmethod
+    def convert_binary_to_text(binary_filename, text_filename):
+        """
+        Convert a graph file from the binary format to the text format.
+
+        :param binary_filename: The name of the binary graph file.
+        :type binary_filename: str
+        :param text_filename: The name of the text graph file to write.
+        :type text_filename: str
+        """
+        with CompactGraph.from_binary_file(binary_filename) as graph:
+            write_graph(graph, text_filename)
+
+    def generate_random_graph(self, nr_of_vertices, nr_of_edges, seed=None):
+        """
+        Generate a random graph with nr_of_edges distinct edges (see random_edge_arrays).
 
         :param nr_of_vertices: The number of vertices of the graph.
         :type nr_of_vertices: int
         :param nr_of_edges: The number of edges of the graph.
         :type nr_of_edges: int
+        :param seed: The seed of the random generator, or None for a random one. Default value is None.
+        :type seed: int
+        :raises ValueError: If there are more edges than the nr_of_vertices ** 2 possible ones.
+        """
+        starts, ends, costs = random_edge_arrays(nr_of_vertices, nr_of_edges, seed)
+        if not isinstance(self.graph, Graph):
+            self.__close_graph()
+            self.graph = Graph()
+        # The graph is cleared instead of replaced, so that its snapshots can still be restored
+        self.graph.clear(nr_of_vertices)
+        if self.journal is not None:
+            # The random graph replaces the graph of the journal
+            self.close_journal()
+        self.graph.add_edges_bulk(zip(starts.tolist(), ends.tolist(), costs.tolist()))
+
+    @staticmethod
+    def write_random_graph_to_file(filename, nr_of_vertices, nr_of_edges, seed=None, binary=False):
         """
-        copy = self.graph.get_copy()
-        self.graph = Graph(nr_of_vertices, copy)
-        for i in range(nr_of_edges):
-            start_node = randint(0, nr_of_vertices - 1)
-            end_node = randint(0, nr_of_vertices - 1)
-            while self.graph.checker_of_edge_existence(start_node, end_node):
-                start_node = randint(0, nr_of_vertices - 1)
-                end_node = randint(0, nr_of_vertices - 1)
-            self.graph.adder_of_edge_to_graph(start_node, end_node, i)
-            self.graph.setter_of_cost_on_edge(i, randint(1, 100))
+        Write a random graph straight to a file, without building it (see write_random_graph).
 
-    def forward_bfs(self, start_node, end_node):
+        :param filename: The name of the file.
+        :type filename: str
+        :param nr_of_vertices: The number of vertices of the graph.
+        :type nr_of_vertices: int
+        :param nr_of_edges: The number of edges of the graph.
+        :type nr_of_edges: int
+        :param seed: The seed of the random generator, or None for a random one. Default value is None.
+        :type seed: int
+        :param binary: If True, write the binary format, otherwise the text format. Default value is False.
+        :type binary: bool
+        :return: A tuple (bytes_written, seconds).
+        :rtype: tuple
+        :raises ValueError: If there are more edges than the nr_of_vertices ** 2 possible ones.
         """
-        This function finds the shortest path between two nodes in a directed graph using a forward breadth-first search, starting from the start node.
+        return write_random_graph(filename, nr_of_vertices, nr_of_edges, seed, binary)
+
+    @cached_query
+    def forward_bfs(self, start_node, end_node, budget=None):
+        """
+        This function finds the shortest path between two nodes in a directed graph using a breadth-first search.
+        A complete search tree from the start node kept by single_source is only walked back; otherwise the path is
+        found by a bidirectional search (see bidirectional_bfs), which explores far fewer nodes than a forward
+        search from the start node.
         :param start_node: the start node
         :param end_node: the end node
-        :return: the shortest path between the two nodes
-        """
-        visited = [False] * self.graph.getter_for_vertices_counter()
-        queue = []
-        exists_a_path = False
-        queue.append(start_node)
-        visited[start_node] = True
-        parent = [None] * self.graph.getter_for_vertices_counter()
-        out_edges = self.graph.get_child_edges()
-        while queue:
-            node = queue.pop(0)
-            if node == end_node:
-                exists_a_path = True
-                break
-            for neighbour in out_edges[node]:  # Traverse out edges for forward BFS
-                if not visited[neighbour]:
-                    queue.append(neighbour)
-                    visited[neighbour] = True
-                    parent[neighbour] = node
-        if not exists_a_path:  # Simplified condition check
+        :param budget: the Budget charged for every expanded node, or None for no limit; when it runs out before
+                       the path is found, the search stops, None is returned and budget.status tells why
+        :return: the shortest path between the two nodes, an empty list if there is none, or None if the budget ran
+                 out first
+        """
+        tree = self.__kept_tree("bfs", start_node)
+        if tree is not None:
+            return tree.path_to(end_node)
+        return self.__bidirectional_bfs(start_node, end_node, budget)
+
+    @cached_query
+    def bidirectional_bfs(self, start_node, end_node, budget=None):
+        """
+        This function finds the shortest path between two nodes in a directed graph using a bidirectional
+        breadth-first search: one search follows the outbound edges from the start node, the other one the
+        inbound edges from the end node, and the smaller frontier is always expanded by a whole level, until
+        the two searches meet.
+        :param start_node: the start node
+        :param end_node: the end node
+        :param budget: the Budget charged for every expanded node, or None for no limit; when it runs out before
+                       the path is found, the search stops, None is returned and budget.status tells why
+        :return: the shortest path between the two nodes, an empty list if there is none, or None if the budget ran
+                 out first
+        """
+        return self.__bidirectional_bfs(start_node, end_node, budget)
+
+    def __bidirectional_bfs(self, start_node, end_node, budget=None):
+        """
+        complexity: O(v + e), where v - number of vertices, e - number of edges
+        The search of bidirectional_bfs, run on arrays indexed by the dense indices of the vertices (see
+        Graph.getter_vertex_labels).
+        """
+        if start_node == end_node:
+            return [start_node]
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        if start_node not in index or end_node not in index:
             return []
-        path = []
-        node = end_node  # Start reconstructing path from the end node
-        while node != start_node:
-            path.append(node)
-            node = parent[node]
-        path.append(start_node)  # Add the start node to complete the path
-        return path[::-1]  # Reverse the path to get it in the forward direction
+        out_edges, _ = self.graph.getter_indexed_adjacency()
+        in_edges, _ = self.graph.getter_indexed_inbound_adjacency()
+
+        start, end = index[start_node], index[end_node]
+        forward_parent = [-1] * len(labels)
+        backward_parent = [-1] * len(labels)
+        # -1 for the nodes not reached yet by a search
+        forward_distance = [-1] * len(labels)
+        backward_distance = [-1] * len(labels)
+        forward_distance[start] = 0
+        backward_distance[end] = 0
+        forward_frontier = deque([start])
+        backward_frontier = deque([end])
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, edges, parent, distance = forward_frontier, out_edges, forward_parent, forward_distance
+                other_distance = backward_distance
+            else:
+                frontier, edges, parent, distance = backward_frontier, in_edges, backward_parent, backward_distance
+                other_distance = forward_distance
+            meeting = -1
+            for _ in range(len(frontier)):
+                if budget is not None and not budget.spend():
+                    # Unlike the empty path, None tells that the nodes may still be connected
+                    return None
+                node = frontier.popleft()
+                for neighbour in edges[node]:
+                    if distance[neighbour] >= 0:
+                        continue
+                    parent[neighbour] = node
+                    distance[neighbour] = distance[node] + 1
+                    if other_distance[neighbour] >= 0:
+                        # Every meeting point found in this level is one step further from the expanded side,
+                        # so the best one is the closest to the other side
+                        if meeting < 0 or other_distance[neighbour] < other_distance[meeting]:
+                            meeting = neighbour
+                    frontier.append(neighbour)
+            if meeting >= 0:
+                path = []
+                node = meeting
+                while node >= 0:
+                    path.append(labels[node])
+                    node = forward_parent[node]
+                path.reverse()
+                node = backward_parent[meeting]
+                while node >= 0:
+                    path.append(labels[node])
+                    node = backward_parent[node]
+                return path
+        return []
 
 
     """
@@ -115,49 +488,515 @@ class Controller:
     of length at most k, where s is the starting vertex.
     """
 
-    def lowest_cost_walk(self, start_vertex, end_vertex):
-        infinity = 9999999999
+    def bellman_ford(self, start_vertex, budget=None):
+        """
+        complexity: O(v*e) in the worst case, usually close to O(e), where v - number of vertices, e - number of edges
+        Compute the lowest costs of the walks from start_vertex to every reachable vertex using the queue based
+        Bellman-Ford algorithm (SPFA): only the vertices whose cost just decreased are relaxed again, so the
+        computation stops as soon as nothing changes, and the memory used is O(v).
 
-        n = self.graph.getter_for_vertices_counter()
-        d = [[infinity for _ in range(n)] for _ in range(n)]
-        p = [[None for _ in range(n)] for _ in range(n)]
+        :param start_vertex: The vertex from which the walks start.
+        :param budget: The Budget charged for every dequeued vertex, or None for no limit. Default value is None.
+        :type budget: Budget
+        :return: A tuple (dist, parent) of dictionaries: dist[x] is the lowest cost of a walk from start_vertex to x
+                 and parent[x] the vertex before x on that walk (None for start_vertex). Unreachable vertices are
+                 missing from both dictionaries. If the budget runs out, the costs found so far are returned:
+                 they are upper bounds of the lowest costs.
+        :rtype: tuple
+        :raises NegativeCycleError: If a negative cost cycle is reachable from start_vertex.
+        """
+        return self.__spfa([start_vertex], budget)
 
-        d[start_vertex][0] = 0
+    def __spfa(self, sources, budget=None):
+        """
+        complexity: O(v*e) in the worst case, where v - number of vertices, e - number of edges
+        The queue based Bellman-Ford algorithm of bellman_ford, started from every vertex of sources at cost 0.
 
+        :return: A tuple (dist, parent) of dictionaries, as for bellman_ford.
+        :rtype: tuple
+        :raises NegativeCycleError: If a negative cost cycle is reachable from sources.
+        """
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        dist = {source: 0 for source in sources if source not in index}
+        parent = dict.fromkeys(dist)
+        indexed_dist, indexed_parent, reached = self.__indexed_spfa([index[s] for s in sources if s in index], budget)
+        for i in reached:
+            dist[labels[i]] = indexed_dist[i]
+            parent[labels[i]] = labels[indexed_parent[i]] if indexed_parent[i] >= 0 else None
+        return dist, parent
 
-        for k in range(1, n):
-            for x in self.graph.getter_for_all_vertices():
-                d[x][k] = d[x][k - 1]
-                p[x][k] = p[x][k - 1]
-                for y in self.graph.getter_inbound_neighbours_near_vertex(x):
-                    if d[y][k - 1] + self.graph.getter_the_cost_of_edge(self.graph.getter_id_of_edge(y, x)) < d[x][k]:
-                        d[x][k] = d[y][k - 1] + self.graph.getter_the_cost_of_edge(self.graph.getter_id_of_edge(y, x))
-                        p[x][k] = y
+    def __indexed_spfa(self, sources, budget=None):
+        """
+        complexity: O(v*e) in the worst case, where v - number of vertices, e - number of edges
+        The queue based Bellman-Ford algorithm over the dense indices of the vertices (see
+        Graph.getter_vertex_labels), started from the indices of sources at cost 0. Started from every vertex, it
+        computes the potentials of Johnson's algorithm, as if from a virtual vertex with a 0 cost edge to every
+        vertex.
+
+        :return: A tuple (dist, parent, reached) of two lists indexed by the dense indices (dist[i] is None and
+                 parent[i] -1 when i was not reached) and of the list of the reached indices.
+        :rtype: tuple
+        :raises NegativeCycleError: If a negative cost cycle is reachable from sources.
+        """
+        size = len(self.graph.getter_vertex_labels())
+        n = len(self.graph.getter_vertex_index())
+        targets, costs = self.graph.getter_indexed_adjacency()
+        dist = [None] * size
+        parent = [-1] * size
+        length = [0] * size
+        in_queue = bytearray(size)
+        reached = []
+        for source in sources:
+            if dist[source] is None:
+                dist[source] = 0
+                in_queue[source] = True
+                reached.append(source)
+        queue = deque(reached)
+        while queue:
+            if budget is not None and not budget.spend():
+                break
+            x = queue.popleft()
+            in_queue[x] = False
+            dist_x = dist[x]
+            for y, cost in zip(targets[x], costs[x]):
+                candidate = dist_x + cost
+                if dist[y] is None or candidate < dist[y]:
+                    if dist[y] is None:
+                        reached.append(y)
+                    dist[y] = candidate
+                    parent[y] = x
+                    length[y] = length[x] + 1
+                    if length[y] >= n:
+                        # A walk with n edges that is still improving must go around a negative cycle
+                        raise NegativeCycleError(self.__find_negative_cycle(targets, costs, dist, parent, reached, y))
+                    if not in_queue[y]:
+                        queue.append(y)
+                        in_queue[y] = True
+        return dist, parent, reached
+
+    def __find_negative_cycle(self, targets, costs, dist, parent, reached, vertex):
+        """
+        complexity: O(v*e), where v - number of vertices, e - number of edges
+        Extract a negative cost cycle once one was detected at the dense index vertex by __indexed_spfa.
+
+        The parent pointers are followed from vertex; if they do not close a cycle yet, full relaxation rounds
+        are run over the reached vertices until the last relaxed vertex leads to one, as in the classic
+        Bellman-Ford cycle extraction.
 
-        for x in range(n):
-            if d[x][n - 1] != d[x][n - 2]:
-                raise Exception("The graph contains a negative cost cycle!")
+        :return: The vertices of the cycle, in order, with the first vertex repeated at the end.
+        :rtype: list
+        """
+        def walk(v):
+            seen = {}
+            walked = []
+            while v >= 0 and v not in seen:
+                seen[v] = len(walked)
+                walked.append(v)
+                v = parent[v]
+            if v < 0:
+                return None
+            cycle = walked[seen[v]:][::-1]
+            return cycle + [cycle[0]]
+
+        cycle = walk(vertex)
+        for _ in range(len(self.graph.getter_vertex_index())):
+            if cycle is not None:
+                break
+            for x in list(reached):
+                for y, cost in zip(targets[x], costs[x]):
+                    if dist[y] is None or dist[x] + cost < dist[y]:
+                        if dist[y] is None:
+                            reached.append(y)
+                        dist[y] = dist[x] + cost
+                        parent[y] = x
+                        vertex = y
+            cycle = walk(vertex)
+        labels = self.graph.getter_vertex_labels()
+        return None if cycle is None else [labels[v] for v in cycle]
+
+    def dijkstra(self, start_vertex, end_vertex=None, budget=None):
+        """
+        complexity: O(e*log(v)), where v - number of vertices, e - number of edges
+        Compute the lowest costs of the walks from start_vertex using Dijkstra's algorithm on a binary heap.
+        Outdated heap entries are skipped when popped instead of being removed (lazy deletion), and the search
+        stops as soon as end_vertex is settled. All the costs must be non-negative.
+        The search runs on arrays indexed by the dense indices of the vertices (see Graph.getter_vertex_labels).
 
-        if d[end_vertex][n - 1] == infinity:
+        :param start_vertex: The vertex from which the walks start.
+        :param end_vertex: The vertex at which to stop, or None to reach every vertex. Default value is None.
+        :param budget: The Budget charged for every settled vertex, or None for no limit. Default value is None.
+        :type budget: Budget
+        :return: A tuple (dist, parent) of dictionaries, as for bellman_ford. When end_vertex is given or the
+                 budget runs out, only the settled vertices are guaranteed to have their final cost.
+        :rtype: tuple
+        """
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        if start_vertex not in index:
+            return {start_vertex: 0}, {start_vertex: None}
+        targets, costs = self.graph.getter_indexed_adjacency()
+        end = index.get(end_vertex, -1)
+        dist = [None] * len(labels)
+        parent = [-1] * len(labels)
+        settled = bytearray(len(labels))
+        start = index[start_vertex]
+        dist[start] = 0
+        reached = [start]
+        heap = [(0, start)]
+        while heap:
+            dist_x, x = heapq.heappop(heap)
+            if settled[x]:
+                continue
+            if budget is not None and not budget.spend():
+                break
+            settled[x] = True
+            if x == end:
+                break
+            for y, cost in zip(targets[x], costs[x]):
+                candidate = dist_x + cost
+                if not settled[y] and (dist[y] is None or candidate < dist[y]):
+                    if dist[y] is None:
+                        reached.append(y)
+                    dist[y] = candidate
+                    parent[y] = x
+                    heapq.heappush(heap, (candidate, y))
+        return ({labels[i]: dist[i] for i in reached},
+                {labels[i]: (labels[parent[i]] if parent[i] >= 0 else None) for i in reached})
+
+    def single_source(self, start_vertex, algorithm=None, budget=None, end_vertex=None):
+        """
+        Compute the walks from start_vertex to every vertex it reaches, as a ShortestPathTree from which the walk
+        to any vertex is rebuilt in O(length of the walk).
+
+        The last complete tree of every algorithm is kept, so the queries from the same start vertex on the
+        unchanged graph (same version) reuse it instead of searching the graph again. When there is no such tree
+        and end_vertex is given, the breadth-first search and Dijkstra's algorithm stop as soon as end_vertex is
+        reached; the tree they return then only holds the walk to end_vertex for sure, so it is not kept.
+
+        :param start_vertex: The vertex from which the walks start.
+        :param algorithm: "bfs" for the walks with the fewest edges, "dijkstra" or "bellman_ford" for the lowest
+                          cost walks, or None to choose between the last two from the costs of the graph.
+                          Default value is None.
+        :type algorithm: str
+        :param budget: The Budget of the search, or None for no limit; a tree cut short by its budget is marked
+                       incomplete and is not kept. Default value is None.
+        :type budget: Budget
+        :param end_vertex: The only vertex whose walk is needed, or None for every vertex. Bellman-Ford's algorithm
+                           cannot stop early and ignores it. Default value is None.
+        :rtype: ShortestPathTree
+        :raises NegativeCycleError: If a negative cost cycle is reachable from start_vertex.
+        :raises ValueError: If algorithm is unknown, or is "dijkstra" and the graph has negative costs.
+        """
+        if algorithm is None:
+            algorithm = "bellman_ford" if self.graph.has_negative_costs() else "dijkstra"
+        tree = self.__kept_tree(algorithm, start_vertex)
+        if tree is not None:
+            return tree
+        if algorithm == "bfs":
+            dist, parent = self.__bfs_tree(start_vertex, budget, end_vertex)
+        elif algorithm == "dijkstra":
+            if self.graph.has_negative_costs():
+                raise ValueError("Dijkstra's algorithm cannot be used on a graph with negative costs!")
+            dist, parent = self.dijkstra(start_vertex, end_vertex, budget)
+        elif algorithm == "bellman_ford":
+            dist, parent = self.bellman_ford(start_vertex, budget)
+            end_vertex = None
+        else:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected bfs, dijkstra or bellman_ford.")
+        tree = ShortestPathTree(start_vertex, dist, parent, self.graph.getter_version(),
+                                budget is None or not budget.exhausted())
+        # A search that reached end_vertex may have stopped early, one that did not has searched everything
+        if tree.complete and (end_vertex is None or end_vertex not in dist):
+            self.__trees[algorithm] = tree
+        return tree
+
+    def __kept_tree(self, algorithm, start_vertex):
+        """
+        :return: The complete tree of algorithm from start_vertex kept for the current version of the graph, or
+                 None if there is none.
+        :rtype: ShortestPathTree
+        """
+        tree = self.__trees.get(algorithm)
+        if tree is not None and tree.source == start_vertex and tree.version == self.graph.getter_version():
+            return tree
+        return None
+
+    def __bfs_tree(self, start_node, budget=None, end_node=None):
+        """
+        complexity: O(v + e), where v - number of vertices, e - number of edges
+        Run a forward breadth-first search from start_node over the whole graph, or until end_node is reached, on
+        arrays indexed by the dense indices of the vertices (see Graph.getter_vertex_labels).
+
+        :return: A tuple (dist, parent) of dictionaries: dist[x] is the number of edges of the shortest path from
+                 start_node to x and parent[x] the node before x on that path (None for start_node).
+        :rtype: tuple
+        """
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        if start_node not in index:
+            return {start_node: 0}, {start_node: None}
+        targets, _ = self.graph.getter_indexed_adjacency()
+        dist = [-1] * len(labels)
+        parent = [-1] * len(labels)
+        start = index[start_node]
+        end = index.get(end_node, -1)
+        dist[start] = 0
+        reached = [start]
+        queue = deque([start])
+        while queue:
+            if end >= 0 and dist[end] >= 0:
+                break
+            if budget is not None and not budget.spend():
+                break
+            node = queue.popleft()
+            for neighbour in targets[node]:  # Traverse out edges for forward BFS
+                if dist[neighbour] < 0:
+                    reached.append(neighbour)
+                    queue.append(neighbour)
+                    dist[neighbour] = dist[node] + 1
+                    parent[neighbour] = node
+        return ({labels[i]: dist[i] for i in reached},
+                {labels[i]: (labels[parent[i]] if parent[i] >= 0 else None) for i in reached})
+
+    @cached_query
+    def lowest_cost_walk(self, start_vertex, end_vertex, budget=None):
+        """
+        Find a lowest cost walk between the given vertices.
+        Dijkstra's algorithm is used when the graph has no negative cost edge, stopping as soon as end_vertex is
+        settled, the queue based Bellman-Ford algorithm otherwise; its walks from start_vertex are kept (see
+        single_source), so the next queries from start_vertex are answered without searching the graph again.
+
+        :param start_vertex: The start vertex.
+        :param end_vertex: The end vertex.
+        :param budget: The Budget of the search, or None for no limit. Default value is None.
+        :type budget: Budget
+        :return: A tuple (cost, path), where path is the list of vertices of the walk. If the budget runs out,
+                 the best walk found so far is returned, or (None, []) if end_vertex was not reached yet.
+        :rtype: tuple
+        :raises NegativeCycleError: If a negative cost cycle is reachable from start_vertex.
+        :raises Exception: If there is no walk between the given vertices.
+        """
+        return self.__walk_result(self.single_source(start_vertex, None, budget, end_vertex), end_vertex)
+
+    @staticmethod
+    def __walk_result(tree, end_vertex):
+        """
+        Turn a shortest path tree into the (cost, path) pair of the lowest cost walk queries.
+
+        :raises Exception: If the tree is complete and does not reach end_vertex.
+        """
+        if not tree.complete:
+            path = tree.path_to(end_vertex)
+            return (tree.distance_to(end_vertex) if path else None), path
+        if not tree.reaches(end_vertex):
             raise Exception("There is no path between the given vertices!")
 
-        path = []
-        current_vertex = end_vertex
-        k = n - 1
-        while current_vertex is not None:
-            path.append(current_vertex)
-            current_vertex = p[current_vertex][k]
-            k -= 1
+        return tree.distance_to(end_vertex), tree.path_to(end_vertex)
+
+    @cached_query
+    def lowest_cost_walk_dijkstra(self, start_vertex, end_vertex, budget=None):
+        """
+        Find a lowest cost walk between the given vertices, using Dijkstra's algorithm, stopped as soon as end_vertex
+        is settled unless a complete tree from start_vertex is kept (see single_source).
+
+        :param start_vertex: The start vertex.
+        :param end_vertex: The end vertex.
+        :param budget: The Budget of the search, or None for no limit. Default value is None.
+        :type budget: Budget
+        :return: A tuple (cost, path), where path is the list of vertices of the walk; see lowest_cost_walk for
+                 the result of an exhausted budget.
+        :rtype: tuple
+        :raises ValueError: If the graph has negative cost edges.
+        :raises Exception: If there is no walk between the given vertices.
+        """
+        return self.__walk_result(self.single_source(start_vertex, "dijkstra", budget, end_vertex), end_vertex)
+
+    def lowest_cost_walks(self, start_vertex, end_vertices, budget=None):
+        """
+        Find the lowest cost walks from start_vertex to each of end_vertices with a single shortest path
+        computation (see single_source).
+
+        :param start_vertex: The start vertex.
+        :param end_vertices: The end vertices.
+        :type end_vertices: list
+        :param budget: The Budget of the search, or None for no limit. Default value is None.
+        :type budget: Budget
+        :return: The list of the (cost, path) pairs of the walks, in the order of end_vertices; (None, []) when
+                 there is no walk to the end vertex (or when the budget ran out before it was reached).
+        :rtype: list
+        :raises NegativeCycleError: If a negative cost cycle is reachable from start_vertex.
+        """
+        tree = self.single_source(start_vertex, None, budget)
+        walks = []
+        for end_vertex in end_vertices:
+            path = tree.path_to(end_vertex)
+            walks.append(((tree.distance_to(end_vertex) if path else None), path))
+        return walks
+
+    def batch_lowest_cost_walks(self, queries, max_workers=None):
+        """
+        Answer many lowest cost walk queries in parallel, in a pool of worker processes.
 
-        path.reverse()
+        The queries are grouped by start vertex, so every start vertex costs one shortest path computation
+        (see lowest_cost_walks) whatever its number of end vertices, and the groups are spread over the workers.
+        The graph is written once to a temporary binary file that every worker memory-maps as a CompactGraph,
+        so only the vertices of the queries and the results are sent between the processes.
 
-        return d[end_vertex][n - 1], path
+        :param queries: The (start_vertex, end_vertex) pairs to answer; the vertices must be non-negative integers.
+        :param max_workers: The number of worker processes, or None for one per CPU. Default value is None.
+        :type max_workers: int
+        :return: A generator of (start_vertex, end_vertex, cost, path) results, yielded as soon as the group of
+                 their start vertex is answered, so not in the order of queries; cost is None and path empty when
+                 there is no walk.
+        :raises NegativeCycleError: If a negative cost cycle is reachable from one of the start vertices.
+        """
+        targets_by_source = {}
+        for start_vertex, end_vertex in queries:
+            targets_by_source.setdefault(start_vertex, []).append(end_vertex)
+        descriptor, filename = tempfile.mkstemp(suffix=".bin")
+        os.close(descriptor)
+        try:
+            self.write_binary_graph_to_file(filename)
+            with ProcessPoolExecutor(max_workers, initializer=_init_batch_worker, initargs=(filename,)) as executor:
+                futures = [executor.submit(_answer_batch_source, start_vertex, end_vertices)
+                           for start_vertex, end_vertices in targets_by_source.items()]
+                try:
+                    for future in as_completed(futures):
+                        yield from future.result()
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            os.remove(filename)
 
-    def prim_algorithm(self, start):
+    def floyd_warshall(self, filename=None, budget=None):
+        """
+        complexity: θ(v^3), where v - number of vertices
+        Compute the lowest costs of the walks between every pair of vertices with the Floyd-Warshall algorithm,
+        vectorized over NumPy when it is installed (see distance_matrix.floyd_warshall). Meant for dense graphs.
+
+        :param filename: The name of the .npy file in which to store the matrix (mapped in memory, NumPy only), or
+                         None to keep it in memory. Default value is None.
+        :type filename: str
+        :param budget: The Budget charged for every intermediate vertex, or None for no limit. Default value is None.
+        :type budget: Budget
+        :return: A tuple (vertices, matrix): the list of vertices, in the order of their dense indices (see
+                 Graph.getter_vertex_labels), and the matrix of costs, where matrix[i][j] is the lowest cost of a
+                 walk from vertices[i] to vertices[j] (inf if there is none).
+        :rtype: tuple
+        :raises NegativeCycleError: If the graph contains a negative cost cycle.
+        """
+        vertices, rows, matrix = self.__new_distance_matrix(filename)
+        targets, costs = self.graph.getter_indexed_adjacency()
+        for x, row in enumerate(rows):
+            if row < 0:
+                continue
+            matrix_row = matrix[row]
+            for y, cost in zip(targets[x], costs[x]):
+                matrix_row[rows[y]] = min(matrix_row[rows[y]], cost)
+        if floyd_warshall(matrix, budget):
+            # The walks around the cycle are found again, and reported, by Bellman-Ford
+            self.bellman_ford(next(vertices[i] for i in range(len(vertices)) if matrix[i][i] < 0))
+        return vertices, matrix
+
+    def johnson(self, filename=None, budget=None):
+        """
+        complexity: O(v*e*log(v)), plus O(v*e) if there are negative costs, where v - number of vertices,
+        e - number of edges
+        Compute the lowest costs of the walks between every pair of vertices with Johnson's algorithm: the costs
+        are made non-negative with the potentials h computed by Bellman-Ford (cost(x, y) + h(x) - h(y) >= 0), and
+        Dijkstra's algorithm is run from every vertex on the reweighted costs. Meant for sparse graphs.
+
+        :param filename: The name of the .npy file in which to store the matrix (mapped in memory, NumPy only), or
+                         None to keep it in memory. Default value is None.
+        :type filename: str
+        :param budget: The Budget charged for every vertex dequeued or settled, or None for no limit; when it runs
+                       out, the rows of the sources not done yet are left at inf. Default value is None.
+        :type budget: Budget
+        :return: A tuple (vertices, matrix), as for floyd_warshall.
+        :rtype: tuple
+        :raises NegativeCycleError: If the graph contains a negative cost cycle.
+        """
+        vertices, rows, matrix = self.__new_distance_matrix(filename)
+        targets, costs = self.graph.getter_indexed_adjacency()
+        sources = [x for x, row in enumerate(rows) if row >= 0]
+        if self.graph.has_negative_costs():
+            potentials, _, _ = self.__indexed_spfa(sources, budget)
+            if budget is not None and budget.exhausted():
+                return vertices, matrix
+        else:
+            potentials = [0] * len(rows)
+        for source in sources:
+            if budget is not None and budget.exhausted():
+                break
+            row = matrix[rows[source]]
+            source_potential = potentials[source]
+            settled = bytearray(len(rows))
+            dist = [None] * len(rows)
+            dist[source] = 0
+            heap = [(0, source)]
+            while heap:
+                dist_x, x = heapq.heappop(heap)
+                if settled[x]:
+                    continue
+                if budget is not None and not budget.spend():
+                    break
+                settled[x] = True
+                row[rows[x]] = dist_x - source_potential + potentials[x]
+                potential_x = potentials[x]
+                for y, cost in zip(targets[x], costs[x]):
+                    candidate = dist_x + cost + potential_x - potentials[y]
+                    if not settled[y] and (dist[y] is None or candidate < dist[y]):
+                        dist[y] = candidate
+                        heapq.heappush(heap, (candidate, y))
+        return vertices, matrix
+
+    def all_pairs_shortest_paths(self, filename=None, budget=None):
+        """
+        Compute the lowest costs of the walks between every pair of vertices, with floyd_warshall on dense graphs
+        of at most FLOYD_WARSHALL_MAX_VERTICES vertices when NumPy is installed, and with johnson otherwise.
+
+        :return: A tuple (vertices, matrix), as for floyd_warshall.
+        :rtype: tuple
+        :raises NegativeCycleError: If the graph contains a negative cost cycle.
+        """
+        v = self.graph.getter_number_of_vertices()
+        if np is not None and v <= FLOYD_WARSHALL_MAX_VERTICES and self.graph.getter_number_of_edges() * 256 >= v * v:
+            return self.floyd_warshall(filename, budget)
+        return self.johnson(filename, budget)
+
+    def __new_distance_matrix(self, filename):
+        """
+        Allocate the distance matrix of the all-pairs algorithms, with 0 on the diagonal.
+
+        :return: A tuple (vertices, rows, matrix): the list of vertices in the order of their dense indices, the
+                 list giving the row of the matrix of every dense index (-1 for the indices that are not vertices,
+                 see CompactGraph.getter_vertex_labels) and the matrix.
+        :rtype: tuple
+        """
+        index = self.graph.getter_vertex_index()
+        vertices = []
+        rows = []
+        for vertex in self.graph.getter_vertex_labels():
+            if vertex in index:
+                rows.append(len(vertices))
+                vertices.append(vertex)
+            else:
+                rows.append(-1)
+        matrix = new_distance_matrix(len(vertices), filename)
+        for i in range(len(vertices)):
+            matrix[i][i] = 0
+        return vertices, rows, matrix
+
+    @cached_query
+    def prim_algorithm(self, start, budget=None):
         """
         Find the minimum spanning tree (MST) of the graph starting from the given vertex <start> using
         Prim's Algorithm.
         :param start: The vertex where we want Prim's Algorithm to start from; integer
+        :param budget: The Budget charged for every vertex taken from the queue, or None for no limit; when it
+                       runs out, the edges of the tree grown so far are returned
         :return: The edges from the minimum spanning tree; list of pairs representing the edges: (_from, _to)
         """
         if start not in self.graph.getter_for_all_vertices():
@@ -178,6 +1017,8 @@ class Controller:
             q.put((dist[neighbour], neighbour))
 
         while not q.empty():
+            if budget is not None and not budget.spend():
+                break
             top = q.get()
             top_vertex = top[1]
             if not processed[top_vertex]:
@@ -191,32 +1032,369 @@ class Controller:
 
         return tree_edges
 
-    def DFSNearestNeighbour(self, sourceVertex, cycleLength):
-        self.graph.visited[sourceVertex] = True
-        outboundNeighbours = self.graph.get_child_edges()[sourceVertex]
-        sorted_items=sorted(outboundNeighbours.items(), key=lambda item:self.graph.get_costs()[item[1]])
-        hasFoundOriginalVertex = False
-
-        for neighbour in sorted_items:
-            if neighbour[0] == self.graph.originalVertex and cycleLength == self.graph.getter_number_of_vertices() - 1:
-                self.graph.hamPathVertices.append(sourceVertex)
-                self.graph.hamPathCost += self.graph.get_costs()[neighbour[1]]
-                return True
-
-            elif not self.graph.visited[neighbour[0]]:
-                hasFoundOriginalVertex = self.DFSNearestNeighbour(neighbour[0], cycleLength + 1)
-                if hasFoundOriginalVertex:
-                    self.graph.hamPathVertices.append(sourceVertex)
-                    self.graph.hamPathCost += self.graph.get_costs()[neighbour[1]]
+    def undirected_costs(self):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        Build the undirected view of the graph used by the minimum spanning tree algorithms: every edge x -> y
+        connects x and y in both directions, and when both x -> y and y -> x exist, the smaller cost is kept.
+        Self-loops are ignored.
+
+        :return: A dictionary {x: {y: cost}} that is symmetric in x and y.
+        :rtype: dict
+        """
+        labels = self.graph.getter_vertex_labels()
+        undirected = self.__indexed_undirected_costs()
+        return {vertex: {labels[y]: cost for y, cost in undirected[x].items()}
+                for vertex, x in self.graph.getter_vertex_index().items()}
+
+    def __indexed_undirected_costs(self):
+        """
+        complexity: θ(v + e), where v - number of vertices, e - number of edges
+        The undirected view of undirected_costs, over the dense indices of the vertices.
+
+        :return: A list of v dictionaries: the dictionary at index x is {y: cost}, symmetric in x and y.
+        :rtype: list
+        """
+        targets, costs = self.graph.getter_indexed_adjacency()
+        undirected = [{} for _ in range(len(targets))]
+        for x in range(len(targets)):
+            neighbours_of_x = undirected[x]
+            for y, cost in zip(targets[x], costs[x]):
+                if x == y:
+                    continue
+                if y not in neighbours_of_x or cost < neighbours_of_x[y]:
+                    neighbours_of_x[y] = cost
+                    undirected[y][x] = cost
+        return undirected
+
+    @cached_query
+    def prim_forest(self, start=None, budget=None):
+        """
+        complexity: O(e*log(v)), where v - number of vertices, e - number of edges
+        Find a minimum spanning forest of the graph, seen as undirected, using Prim's Algorithm on a binary heap.
+        The undirected costs are computed once up front, over the dense indices of the vertices, outdated heap
+        entries are skipped when popped (lazy deletion), and a new tree is grown from every vertex left unreached,
+        so disconnected graphs get one tree per connected component.
+
+        :param start: The vertex from which the first tree is grown, or None to start from the vertex of index 0
+                      (see Graph.getter_vertex_labels). Default value is None.
+        :param budget: The Budget charged for every vertex popped from the heap, or None for no limit; when it
+                       runs out, the edges of the forest grown so far are returned. Default value is None.
+        :type budget: Budget
+        :return: The edges of the forest; list of triples (_from, _to, cost)
+        :rtype: list
+        :raises ValueError: If start is not a vertex of the graph.
+        """
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        if start is not None and start not in index:
+            raise ValueError(f"The vertex {start} does not exist in the graph.")
+        undirected = self.__indexed_undirected_costs()
+        roots = [x for x in range(len(labels)) if labels[x] in index]
+        if start is not None:
+            roots.insert(0, index[start])
+
+        processed = bytearray(len(labels))
+        best = [None] * len(labels)
+        forest_edges = []
+        for root in roots:
+            if processed[root]:
+                continue
+            processed[root] = True
+            heap = [(cost, neighbour, root) for neighbour, cost in undirected[root].items()]
+            heapq.heapify(heap)
+            while heap:
+                if budget is not None and not budget.spend():
+                    return forest_edges
+                cost, vertex, previous = heapq.heappop(heap)
+                if processed[vertex]:
+                    continue
+                processed[vertex] = True
+                forest_edges.append((labels[previous], labels[vertex], cost))
+                for neighbour, neighbour_cost in undirected[vertex].items():
+                    if not processed[neighbour] and (best[neighbour] is None or neighbour_cost < best[neighbour]):
+                        best[neighbour] = neighbour_cost
+                        heapq.heappush(heap, (neighbour_cost, neighbour, vertex))
+        return forest_edges
+
+    @cached_query
+    def kruskal_forest(self, budget=None):
+        """
+        complexity: O(e*log(e)), where e - number of edges
+        Find a minimum spanning forest of the graph, seen as undirected, using Kruskal's Algorithm.
+        The edge IDs are sorted once by cost, and the edges are added in that order whenever they join two
+        different trees, which is checked with a disjoint-set structure over the dense indices of the vertices.
+
+        :param budget: The Budget charged for every edge considered, or None for no limit; when it runs out, the
+                       edges of the forest chosen so far are returned. Default value is None.
+        :type budget: Budget
+        :return: The edges of the forest; list of triples (_from, _to, cost)
+        :rtype: list
+        """
+        index = self.graph.getter_vertex_index()
+        trees = DisjointSet(len(self.graph.getter_vertex_labels()))
+        costs = self.graph.get_costs()
+        edge_ids = costs.keys() if isinstance(costs, dict) else range(len(costs))
+
+        forest_edges = []
+        for edge_id in sorted(edge_ids, key=costs.__getitem__):
+            if budget is not None and not budget.spend():
+                break
+            start_node, end_node = self.graph.getter_of_the_extremities_of_edge(edge_id)
+            if start_node in index and end_node in index and trees.union(index[start_node], index[end_node]):
+                forest_edges.append((start_node, end_node, costs[edge_id]))
+                if len(forest_edges) == len(index) - 1:
+                    break
+        return forest_edges
+
+    def DFSNearestNeighbour(self, sourceVertex, cycleLength, budget=None):
+        """
+        Search, depth first, for a Hamiltonian cycle through self.graph.originalVertex, always trying the cheapest
+        outbound edge first and backtracking when the greedy choice dead-ends.
+
+        The search uses an explicit stack instead of recursion, so the length of the cycle is not limited by the
+        recursion limit. The search runs on the dense indices of the vertices (see Graph.getter_vertex_labels):
+        the outbound neighbours of every vertex are sorted by cost only once, when the vertex is first reached,
+        and the visited vertices are marked in the self.visited bitmap indexed by them (prepared by
+        approximateTSPNearestNeighbour).
+
+        When a cycle is found, its vertices are appended to self.graph.hamPathVertices in reverse order (ending
+        with sourceVertex) and its cost is added to self.graph.hamPathCost.
+
+        :param sourceVertex: The vertex from which the search starts.
+        :param cycleLength: The number of edges already on the cycle before sourceVertex.
+        :param budget: The Budget charged for every vertex of the search, or None for no limit; when it runs out,
+                       the search gives up as if there were no cycle. Default value is None.
+        :type budget: Budget
+        :return: True if a Hamiltonian cycle was found, False otherwise (also when sourceVertex or
+                 self.graph.originalVertex is not in the graph).
+        :rtype: bool
+        """
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        if sourceVertex not in index or self.graph.originalVertex not in index:
+            return False
+        targets, costs = self.graph.getter_indexed_adjacency()
+        original_vertex = index[self.graph.originalVertex]
+        last_length = self.graph.getter_number_of_vertices() - 1
+        visited = self.visited
+        sorted_neighbours = {}
+
+        def neighbours_of(vertex):
+            if vertex not in sorted_neighbours:
+                sorted_neighbours[vertex] = sorted(zip(targets[vertex], costs[vertex]), key=lambda item: item[1])
+            return sorted_neighbours[vertex]
+
+        # stack_vertices[k] is the vertex at depth k, positions[k] the index of its next neighbour to try and
+        # edge_costs[k] the cost of the edge taken from it to the vertex at depth k + 1
+        stack_vertices = [index[sourceVertex]]
+        positions = [0]
+        edge_costs = []
+        visited[stack_vertices[0]] = True
+        while stack_vertices:
+            if budget is not None and not budget.spend():
+                for vertex in stack_vertices:
+                    visited[vertex] = False
+                return False
+            depth = len(stack_vertices) - 1
+            vertex = stack_vertices[depth]
+            neighbours = neighbours_of(vertex)
+            position = positions[depth]
+            descended = False
+            while position < len(neighbours):
+                neighbour, cost = neighbours[position]
+                position += 1
+                if neighbour == original_vertex and cycleLength + depth == last_length:
+                    self.graph.hamPathVertices.extend(labels[v] for v in reversed(stack_vertices))
+                    self.graph.hamPathCost += sum(edge_costs) + cost
                     return True
+                elif not visited[neighbour]:
+                    positions[depth] = position
+                    edge_costs.append(cost)
+                    stack_vertices.append(neighbour)
+                    positions.append(0)
+                    visited[neighbour] = True
+                    descended = True
+                    break
+            if not descended:
+                visited[vertex] = False
+                stack_vertices.pop()
+                positions.pop()
+                if edge_costs:
+                    edge_costs.pop()
+        return False
 
-        self.graph.visited[sourceVertex] = False
-        return hasFoundOriginalVertex
+    def approximateTSPNearestNeighbour(self, budget=None):
+        """
+        Look for a Hamiltonian cycle through vertex 0 with DFSNearestNeighbour; the cycle is left in
+        self.graph.hamPathVertices and its cost in self.graph.hamPathCost (empty and 0 if none was found).
 
-    def approximateTSPNearestNeighbour(self):
+        :param budget: The Budget of the search, or None for no limit. Default value is None.
+        :type budget: Budget
+        """
         self.graph.originalVertex = 0
         self.graph.hamPathCost = 0
+        self.graph.hamPathVertices = []
+
+        size = len(self.graph.getter_vertex_labels())
+        if len(self.visited) < size:
+            self.visited = bytearray(size)
+        else:
+            self.visited[:] = bytes(len(self.visited))
+
+        self.DFSNearestNeighbour(self.graph.originalVertex, 0, budget)
 
-        self.graph.visited = [False] * self.graph.getter_number_of_vertices()
+    def approximate_tsp_local_search(self, start_vertex=0, time_budget=1.0, budget=None):
+        """
+        complexity: O(v + e) for the construction and per improvement pass, where v - number of vertices,
+        e - number of edges (O(v^2) on complete graphs)
+        Find a low cost Hamiltonian cycle in polynomial time: a nearest neighbour tour is built greedily from
+        start_vertex and then improved with Or-opt moves (moving a segment of 1 to 3 vertices elsewhere) and
+        2-opt moves (reversing a segment of the tour) until no move helps or time_budget seconds have passed.
+        Only the moves that create at least one existing edge are tried, so every pass scans the neighbours
+        of each vertex instead of every pair of positions.
+
+        Missing edges are allowed in the tour, so the greedy construction never dead-ends. A missing edge is priced
+        above any difference between the costs of two tours, so tours are ordered by their number of missing edges
+        first and by their cost second, and the local search works to remove the missing edges first. The cost of a
+        tour only sums the edges that exist; a tour with missing edges is not a Hamiltonian cycle of the graph.
+
+        :param start_vertex: The vertex where the tour starts. Default value is 0.
+        :param time_budget: The number of seconds the improvement phase may take. Default value is 1.0.
+        :type time_budget: float
+        :param budget: A Budget charged for every improvement move tried, or None; when it runs out, the best tour
+                       found so far is returned, as when time_budget runs out. Default value is None.
+        :type budget: Budget
+        :return: A tuple (tour, cost, missing_edges, history): the vertices of the tour in order (the edge back to
+                 start_vertex is implied), the cost of its existing edges, the number of its edges that do not
+                 exist (0 for a Hamiltonian cycle), and the list of (seconds_elapsed, cost, missing_edges) triples
+                 recorded after the construction and after every improving move.
+        :rtype: tuple
+        :raises ValueError: If start_vertex is not a vertex of the graph.
+        """
+        started = time.perf_counter()
+        deadline = started + time_budget
+        labels = self.graph.getter_vertex_labels()
+        index = self.graph.getter_vertex_index()
+        if start_vertex not in index:
+            raise ValueError(f"The vertex {start_vertex} does not exist in the graph.")
+        # The tour is built and improved over the dense indices of the vertices, and translated back at the end
+        targets, costs = self.graph.getter_indexed_adjacency()
+        successors = [{y: cost for y, cost in zip(targets[x], costs[x]) if y != x} for x in range(len(labels))]
+        predecessors = [[] for _ in range(len(labels))]
+        for x in range(len(labels)):
+            for y in successors[x]:
+                predecessors[y].append(x)
+
+        # Without its missing edges, a tour costs between -total and total, so the costs of two tours differ by less
+        # than half of missing_cost and the number of missing edges of a tour is its cost / missing_cost, rounded
+        total = sum(abs(value) for row in successors for value in row.values())
+        missing_cost = 4 * total + 1
+
+        def cost(x, y):
+            return successors[x].get(y, missing_cost)
+
+        def record():
+            missing = round(tour_cost / missing_cost)
+            history.append((time.perf_counter() - started, tour_cost - missing * missing_cost, missing))
+
+        # Nearest neighbour construction
+        unvisited = {x for x in range(len(labels)) if labels[x] in index}
+        unvisited.discard(index[start_vertex])
+        tour = [index[start_vertex]]
+        while unvisited:
+            current = tour[-1]
+            following = min((y for y in successors[current] if y in unvisited), key=successors[current].get,
+                            default=None)
+            if following is None:
+                following = next(iter(unvisited))
+            unvisited.discard(following)
+            tour.append(following)
+        n = len(tour)
+        tour_cost = sum(cost(tour[k], tour[(k + 1) % n]) for k in range(n))
+        history = []
+        record()
 
-        self.DFSNearestNeighbour(self.graph.originalVertex, 0)
\ No newline at end of file
+        def positions_of(vertices):
+            positions = [0] * len(labels)
+            for k, vertex in enumerate(vertices):
+                positions[vertex] = k
+            return positions
+
+        def improved_by(delta):
+            nonlocal tour_cost
+            tour_cost += delta
+            record()
+
+        def or_opt_pass():
+            nonlocal tour
+            improved = False
+            for length in (1, 2, 3):
+                position = positions_of(tour)
+                i = 1
+                while i + length <= n:
+                    if time.perf_counter() > deadline or (budget is not None and not budget.spend()):
+                        return improved
+                    p, first, last, q = tour[i - 1], tour[i], tour[i + length - 1], tour[(i + length) % n]
+                    gain = cost(p, first) + cost(last, q) - cost(p, q)
+                    # Insert the segment between a and the vertex after it, where a -> first exists
+                    for a in predecessors[first]:
+                        k = position[a]
+                        if i - 1 <= k <= i + length - 1:
+                            continue
+                        b = tour[(k + 1) % n]
+                        delta = cost(a, first) + cost(last, b) - cost(a, b) - gain
+                        if delta < 0:
+                            segment = tour[i:i + length]
+                            rest = tour[:i] + tour[i + length:]
+                            k = k + 1 if k < i else k + 1 - length
+                            tour = rest[:k] + segment + rest[k:]
+                            position = positions_of(tour)
+                            improved_by(delta)
+                            improved = True
+                            break
+                    i += 1
+            return improved
+
+        def two_opt_pass():
+            improved = False
+            # forward[k] / backward[k]: cost of the first k edges of the path tour[0..n-1], traversed forwards
+            # and backwards, so reversing a segment is priced in constant time even for asymmetric costs
+            forward, backward = [0] * n, [0] * n
+
+            def refresh(first_position):
+                for m in range(max(first_position, 1), n):
+                    forward[m] = forward[m - 1] + cost(tour[m - 1], tour[m])
+                    backward[m] = backward[m - 1] + cost(tour[m], tour[m - 1])
+
+            refresh(1)
+            position = positions_of(tour)
+            for i in range(1, n - 1):
+                if time.perf_counter() > deadline or (budget is not None and not budget.spend()):
+                    return improved
+                a, b = tour[i - 1], tour[i]
+                # Reverse tour[i..j], so that a -> tour[j] becomes an edge of the tour
+                for c in successors[a]:
+                    j = position[c]
+                    if j <= i:
+                        continue
+                    d = tour[(j + 1) % n]
+                    delta = (cost(a, c) + cost(b, d) - cost(a, b) - cost(c, d)
+                             + (backward[j] - backward[i]) - (forward[j] - forward[i]))
+                    if delta < 0:
+                        tour[i:j + 1] = tour[i:j + 1][::-1]
+                        refresh(i)
+                        for m in range(i, j + 1):
+                            position[tour[m]] = m
+                        improved_by(delta)
+                        improved = True
+                        break
+            return improved
+
+        while n > 3 and time.perf_counter() <= deadline and (budget is None or not budget.exhausted()):
+            improved = or_opt_pass()
+            improved = two_opt_pass() or improved
+            if not improved:
+                break
+        _, cost_of_tour, missing_edges = history[-1]
+        return [labels[x] for x in tour], cost_of_tour, missing_edges, history
@@ -0,0 +1,63 @@
+class ShortestPathTree:
+    def __init__(self, source, dist, parent, version, complete=True):
+        """
+        complexity: θ(1)
+        Initialize the result of a single source shortest path computation (see Controller.single_source), from
+        which the walks from source to any vertex are rebuilt without searching the graph again.
+
+        :param source: The vertex from which the walks start.
+        :param dist: dist[x] is the cost (or the number of edges, for a breadth-first search) of the walk from
+                     source to x; the vertices not reached are missing.
+        :type dist: dict
+        :param parent: parent[x] is the vertex before x on that walk, None for source.
+        :type parent: dict
+        :param version: The version of the graph the tree was computed on.
+        :type version: int
+        :param complete: False if the computation was stopped by its budget, so that the walks found are not
+                         necessarily the lowest cost ones and some vertices may be missing. Default value is True.
+        :type complete: bool
+        """
+        self.source = source
+        self.dist = dist
+        self.parent = parent
+        self.version = version
+        self.complete = complete
+
+    def reaches(self, vertex):
+        """
+        complexity: θ(1)
+        :return: True if a walk from the source to vertex was found, False otherwise.
+        :rtype: bool
+        """
+        return vertex in self.dist
+
+    def distance_to(self, vertex):
+        """
+        complexity: θ(1)
+        :return: The cost of the walk from the source to vertex, or None if vertex was not reached.
+        """
+        return self.dist.get(vertex)
+
+    def path_to(self, vertex):
+        """
+        complexity: θ(l), where l - number of vertices of the walk
+        Rebuild the walk from the source to vertex from the parent pointers.
+
+        :return: The list of vertices of the walk, from the source to vertex, or an empty list if vertex was not
+                 reached or if the parent pointers go around a cycle (which an interrupted Bellman-Ford may leave
+                 behind).
+        :rtype: list
+        """
+        if vertex not in self.dist:
+            return []
+        path = []
+        current_vertex = vertex
+        while current_vertex is not None:
+            if len(path) > len(self.parent):
+                return []
+            path.append(current_vertex)
+            current_vertex = self.parent[current_vertex]
+
+        path.reverse()
+
+        return path